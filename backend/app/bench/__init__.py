@@ -0,0 +1 @@
+"""Local provider stand-ins and harnesses for offline performance measurement."""
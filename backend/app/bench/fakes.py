@@ -0,0 +1,293 @@
+from __future__ import annotations
+
+import io
+import json
+import random
+import re
+import threading
+import time
+import wave
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+DEFAULT_SCRIPT = (
+    "Stop scrolling, this changes how you see the topic. "
+    "Here is why everyone is suddenly talking about it. "
+    "The core idea is simpler than it sounds. "
+    "Most people miss one surprising detail. "
+    "Picture it in your everyday routine. "
+    "That is the real takeaway. "
+    "Try it today and see the difference. "
+    "Follow for the next deep dive."
+)
+
+
+@dataclass
+class FakeBehavior:
+    latency_s: float = 0.0  # delay before the first byte
+    chunk_delay_s: float = 0.0  # delay between streamed chunks/tokens
+    error_rate: float = 0.0  # fraction of requests answered with 503
+    payload_scale: float = 1.0  # multiplier on generated payload sizes
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "_Server"
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        return
+
+    def _read_json(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def _maybe_fail(self) -> bool:
+        behavior = self.server.behavior
+        self.server.count_request()
+        time.sleep(behavior.latency_s)
+        if behavior.error_rate and random.random() < behavior.error_rate:
+            self.send_response(503)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            self.wfile.write(b'{"error": "fake overload"}')
+            return True
+        return False
+
+    def _send_json(self, payload: dict, status: int = 200) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, handler: type[_Handler], behavior: FakeBehavior, options: dict[str, Any]) -> None:
+        super().__init__(("127.0.0.1", 0), handler)
+        self.behavior = behavior
+        self.options = options
+        self.requests = 0
+        self._count_lock = threading.Lock()
+
+    def count_request(self) -> None:
+        with self._count_lock:
+            self.requests += 1
+
+
+class FakeServer:
+    """Runs a fake provider on an ephemeral localhost port in a daemon thread."""
+
+    handler: type[_Handler] = _Handler
+
+    def __init__(self, behavior: FakeBehavior | None = None, **options: Any) -> None:
+        self.behavior = behavior or FakeBehavior()
+        self._server = _Server(self.handler, self.behavior, options)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True, name=type(self).__name__)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def requests(self) -> int:
+        return self._server.requests
+
+    def start(self) -> "FakeServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+
+class _LLMHandler(_Handler):
+    def do_POST(self) -> None:  # noqa: N802
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json({"error": "not found"}, status=404)
+            return
+        request = self._read_json()
+        if self._maybe_fail():
+            return
+        model = request.get("model", "fake-model")
+        text = self.server.options.get("script", DEFAULT_SCRIPT)
+        if self.server.options.get("vary"):
+            # A distinct first sentence per request keeps downstream caches cold.
+            text = f"Take {self.server.requests}. {text}"
+        created = int(time.time())
+        if not request.get("stream"):
+            time.sleep(self.server.behavior.chunk_delay_s * len(text.split()))
+            self._send_json(
+                {
+                    "id": "chatcmpl-fake",
+                    "object": "chat.completion",
+                    "created": created,
+                    "model": model,
+                    "choices": [
+                        {"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}
+                    ],
+                    "usage": {"prompt_tokens": 50, "completion_tokens": len(text.split()), "total_tokens": 50},
+                }
+            )
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+
+        def _event(delta: dict, finish: str | None = None) -> None:
+            chunk = {
+                "id": "chatcmpl-fake",
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+        _event({"role": "assistant", "content": ""})
+        for token in re.findall(r"\S+\s*", text):
+            time.sleep(self.server.behavior.chunk_delay_s)
+            _event({"content": token})
+        _event({}, finish="stop")
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+
+class FakeLLMServer(FakeServer):
+    """OpenAI-compatible chat completions (plain and SSE streaming). Use ``url + '/v1'`` as base URL.
+
+    Options: ``script`` (reply text) and ``vary`` (prefix a per-request sentence).
+    """
+
+    handler = _LLMHandler
+
+
+def silent_wav(seconds: float, sample_rate: int = 22050) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(b"\x00\x00" * int(sample_rate * max(0.1, seconds)))
+    return buffer.getvalue()
+
+
+class _TTSHandler(_Handler):
+    def do_POST(self) -> None:  # noqa: N802
+        if "/text-to-speech/" not in self.path:
+            self._send_json({"error": "not found"}, status=404)
+            return
+        request = self._read_json()
+        if self._maybe_fail():
+            return
+        seconds_per_char = self.server.options.get("seconds_per_char", 0.06)
+        audio = silent_wav(len(request.get("text", "")) * seconds_per_char * self.server.behavior.payload_scale)
+        self.send_response(200)
+        self.send_header("Content-Type", "audio/mpeg")
+        self.end_headers()
+        for offset in range(0, len(audio), 16384):
+            if offset:
+                time.sleep(self.server.behavior.chunk_delay_s)
+            self.wfile.write(audio[offset : offset + 16384])
+            self.wfile.flush()
+
+
+class FakeTTSServer(FakeServer):
+    """ElevenLabs-shaped text-to-speech (plain and /stream). Audio is WAV-encoded silence."""
+
+    handler = _TTSHandler
+
+
+def fake_jpeg(width: int, height: int, seed: int = 0) -> bytes:
+    from PIL import Image
+
+    color = ((seed * 53) % 256, (seed * 97) % 256, (seed * 193) % 256)
+    buffer = io.BytesIO()
+    Image.new("RGB", (max(16, width), max(16, height)), color).save(buffer, format="JPEG", quality=85)
+    return buffer.getvalue()
+
+
+class _PexelsHandler(_Handler):
+    def _file_url(self, name: str) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/files/{name}"
+
+    def do_GET(self) -> None:  # noqa: N802
+        path = self.path.split("?", 1)[0]
+        if path.startswith("/files/"):
+            self._serve_file(path.rsplit("/", 1)[-1])
+            return
+        if path not in ("/v1/search", "/videos/search"):
+            self._send_json({"error": "not found"}, status=404)
+            return
+        if self._maybe_fail():
+            return
+        options = self.server.options
+        if path == "/v1/search":
+            photos = [
+                {
+                    "url": f"https://example.invalid/photo/{idx}",
+                    "src": {"large2x": self._file_url(f"photo_{idx}.jpg")},
+                }
+                for idx in range(options.get("photos", 6))
+            ]
+            self._send_json({"photos": photos})
+            return
+        videos = []
+        if options.get("video_path"):
+            for idx in range(options.get("videos", 2)):
+                link = self._file_url(f"video_{idx}.mp4")
+                videos.append(
+                    {
+                        "url": f"https://example.invalid/video/{idx}",
+                        "video_files": [{"quality": "hd", "width": 1080, "link": link}],
+                    }
+                )
+        self._send_json({"videos": videos})
+
+    def _serve_file(self, name: str) -> None:
+        if self._maybe_fail():
+            return
+        scale = self.server.behavior.payload_scale
+        if name.endswith(".mp4") and self.server.options.get("video_path"):
+            with open(self.server.options["video_path"], "rb") as f:
+                body = f.read()
+            content_type = "video/mp4"
+        else:
+            seed = int(re.sub(r"\D", "", name) or 0)
+            body = fake_jpeg(int(1280 * scale), int(1920 * scale), seed)
+            content_type = "image/jpeg"
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        for offset in range(0, len(body), 65536):
+            if offset:
+                time.sleep(self.server.behavior.chunk_delay_s)
+            self.wfile.write(body[offset : offset + 65536])
+
+
+class FakePexelsServer(FakeServer):
+    """Pexels photo/video search plus the file host its results point at.
+
+    Options: ``photos`` (results per photo search), ``videos`` and
+    ``video_path`` (an mp4 to serve; without it video search returns nothing).
+    Photos are generated JPEGs sized by ``payload_scale``.
+    """
+
+    handler = _PexelsHandler
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+import time
+from typing import Any
+
+
+class StubGraph:
+    """Stands in for the compiled LangGraph so the API can be load-tested without providers.
+
+    ``invoke`` sleeps for ``delay_s`` and returns the input state marked completed.
+    """
+
+    def __init__(self, delay_s: float = 0.05) -> None:
+        self.delay_s = delay_s
+        self.invocations = 0
+
+    def invoke(self, payload: Any, config: dict | None = None) -> dict[str, Any]:
+        self.invocations += 1
+        time.sleep(self.delay_s)
+        state = dict(payload) if isinstance(payload, dict) else {}
+        state.update({"status": "completed", "next_action": "complete"})
+        return state
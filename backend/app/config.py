@@ -22,6 +22,48 @@ def _load_env_files() -> None:
 _load_env_files()
 
 
+@dataclass(frozen=True)
+class RenderProfile:
+    name: str
+    width: int
+    height: int
+    fps: int
+    preset: str
+    crf: int
+    threads: int
+
+    @classmethod
+    def from_env(cls, name: str, size: str, preset: str, crf: int, threads: int) -> "RenderProfile":
+        prefix = f"RENDER_{name.upper()}_"
+        width, height = (int(v) for v in os.getenv(prefix + "SIZE", size).lower().split("x"))
+        return cls(
+            name=name,
+            width=width,
+            height=height,
+            fps=int(os.getenv(prefix + "FPS", "30")),
+            preset=os.getenv(prefix + "PRESET", preset),
+            crf=int(os.getenv(prefix + "CRF", str(crf))),
+            threads=int(os.getenv(prefix + "THREADS", str(threads))),
+        )
+
+
+def _env_deadlines(name: str) -> dict[str, float]:
+    """Wall-clock limit per node run in seconds from ``name=seconds,...``; unlisted nodes (or 0) have none."""
+    deadlines: dict[str, float] = {}
+    for item in os.getenv(name, "").split(","):
+        node, _, seconds = item.partition("=")
+        if node.strip() and seconds.strip():
+            deadlines[node.strip()] = float(seconds)
+    return deadlines
+
+
+def _env_flag(name: str, default: bool) -> bool:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    return raw.strip().lower() in {"1", "true", "yes", "on"}
+
+
 @dataclass(frozen=True)
 class Settings:
     project_root: Path
@@ -31,20 +73,47 @@ class Settings:
     logs_root: Path
     openai_api_key: str
     openai_model: str
+    openai_base_url: str
+    script_streaming: bool
+    script_cache_ttl_s: int
     pexels_api_key: str
+    pexels_base_url: str
     elevenlabs_api_key: str
     elevenlabs_voice_id: str
     elevenlabs_model_id: str
+    elevenlabs_base_url: str
     gtts_lang: str
+    render_engine: str
+    render_mode: str
+    render_workers: int
+    render_low_memory: bool
+    render_memory_budget_mb: int
+    render_draft_enabled: bool
+    render_progress_interval_s: float
+    audio_loudness_lufs: float
+    draft_profile: RenderProfile
+    final_profile: RenderProfile
+    caption_font: str
+    job_deadline_s: float
+    max_active_jobs: int
+    max_queued_jobs: int
+    min_free_disk_mb: int
+    min_free_memory_mb: int
+    admission_retry_after_s: int
+    node_deadlines: dict[str, float]
+    profile_sample_rate: float
+    profile_interval_ms: float
     cors_origins: list[str]
 
     @classmethod
     def from_env(cls) -> "Settings":
         root = Path(__file__).resolve().parents[2]
-        data_root = root / "data"
+        data_root = Path(os.getenv("DATA_ROOT") or root / "data").resolve()
         assets_root = data_root / "assets"
         output_root = data_root / "output"
-        logs_root = root / "logs"
+        # Runs with their own DATA_ROOT (benchmarks, load tests) keep their logs out of the repo too.
+        default_logs = data_root / "logs" if os.getenv("DATA_ROOT") else root / "logs"
+        logs_root = Path(os.getenv("LOGS_ROOT") or default_logs).resolve()
         data_root.mkdir(parents=True, exist_ok=True)
         assets_root.mkdir(parents=True, exist_ok=True)
         output_root.mkdir(parents=True, exist_ok=True)
@@ -59,11 +128,36 @@ class Settings:
             logs_root=logs_root,
             openai_api_key=os.getenv("OPENAI_API_KEY", ""),
             openai_model=os.getenv("OPENAI_MODEL", "gpt-4o-mini"),
+            openai_base_url=os.getenv("OPENAI_BASE_URL", ""),
+            script_streaming=_env_flag("SCRIPT_STREAMING", False),
+            script_cache_ttl_s=int(os.getenv("SCRIPT_CACHE_TTL_S", str(7 * 24 * 3600))),
             pexels_api_key=os.getenv("PEXELS_API_KEY", ""),
+            pexels_base_url=os.getenv("PEXELS_BASE_URL", "https://api.pexels.com").rstrip("/"),
             elevenlabs_api_key=os.getenv("ELEVENLABS_API_KEY", ""),
             elevenlabs_voice_id=os.getenv("ELEVENLABS_VOICE_ID", "EXAVITQu4vr4xnSDxMaL"),
             elevenlabs_model_id=os.getenv("ELEVENLABS_MODEL_ID", "eleven_multilingual_v2"),
+            elevenlabs_base_url=os.getenv("ELEVENLABS_BASE_URL", "https://api.elevenlabs.io").rstrip("/"),
             gtts_lang=os.getenv("GTTS_LANG", "en"),
+            render_engine=os.getenv("RENDER_ENGINE", "moviepy").strip().lower(),
+            render_mode=os.getenv("RENDER_MODE", "single").strip().lower(),
+            render_workers=int(os.getenv("RENDER_WORKERS", "0")) or (os.cpu_count() or 1),
+            render_low_memory=_env_flag("RENDER_LOW_MEMORY", False),
+            render_memory_budget_mb=int(os.getenv("RENDER_MEMORY_BUDGET_MB", "0")),
+            render_draft_enabled=_env_flag("RENDER_DRAFT_ENABLED", True),
+            render_progress_interval_s=float(os.getenv("RENDER_PROGRESS_INTERVAL_S", "1.0")),
+            audio_loudness_lufs=float(os.getenv("AUDIO_LOUDNESS_LUFS", "-14")),
+            draft_profile=RenderProfile.from_env("draft", "540x960", "ultrafast", 30, 2),
+            final_profile=RenderProfile.from_env("final", "1080x1920", "medium", 23, 4),
+            caption_font=os.getenv("CAPTION_FONT", ""),
+            job_deadline_s=float(os.getenv("JOB_DEADLINE_S", "0")),
+            max_active_jobs=max(0, int(os.getenv("MAX_ACTIVE_JOBS", "0"))),
+            max_queued_jobs=int(os.getenv("MAX_QUEUED_JOBS", "20")),
+            min_free_disk_mb=int(os.getenv("MIN_FREE_DISK_MB", "0")),
+            min_free_memory_mb=int(os.getenv("MIN_FREE_MEMORY_MB", "0")),
+            admission_retry_after_s=int(os.getenv("ADMISSION_RETRY_AFTER_S", "30")),
+            node_deadlines=_env_deadlines("NODE_DEADLINES"),
+            profile_sample_rate=float(os.getenv("PROFILE_SAMPLE_RATE", "0")),
+            profile_interval_ms=float(os.getenv("PROFILE_INTERVAL_MS", "10")),
             cors_origins=cors_origins,
         )
 
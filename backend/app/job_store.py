@@ -1,8 +1,11 @@
 from __future__ import annotations
 
 import json
+import random
 import threading
+import time
 import uuid
+from collections import deque
 from dataclasses import asdict, dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
@@ -12,9 +15,24 @@ from langgraph.types import Command
 from loguru import logger
 
 from .config import SETTINGS
-from .pipeline import ShortState, build_graph
+from .metrics import ADMISSION_REJECTED, JOBS
+from .pipeline import ShortState, build_graph, graph_input
+from .pipeline.control import job_control, run_control
 from .pipeline.retry import retry_call
 from .pipeline.utils import ensure_dir
+from .profiling import profile_job
+from .system import available_memory_mb, free_disk_mb
+
+CANCEL_REASON = "cancelled by user"
+
+
+class AdmissionRejected(RuntimeError):
+    """The server is at capacity; the client should retry after ``retry_after_s``."""
+
+    def __init__(self, reason: str, detail: str, retry_after_s: int) -> None:
+        super().__init__(detail)
+        self.reason = reason
+        self.retry_after_s = retry_after_s
 
 
 @dataclass
@@ -28,17 +46,28 @@ class JobRecord:
     state: dict[str, Any] = field(default_factory=dict)
     review_payload: dict[str, Any] | None = None
     error: str | None = None
+    # Graph run time across all runs of the job (review pauses excluded), for JOB_DEADLINE_S.
+    run_s: float = 0.0
 
 
 class JobStore:
-    def __init__(self) -> None:
+    def __init__(self, graph: Any | None = None) -> None:
         self._lock = threading.RLock()
         self._jobs: dict[str, JobRecord] = {}
-        self._graph = build_graph()
+        # Cancel requests for jobs whose worker has not registered its control yet.
+        self._cancel_requested: set[str] = set()
+        # Runs waiting for one of MAX_ACTIVE_JOBS worker slots: (job_id, resume payload or None).
+        self._queue: deque[tuple[str, dict[str, Any] | None]] = deque()
+        self._active: set[str] = set()
+        # Admitted by create_job but not yet started; they hold a queue place so admission stays atomic.
+        self._reserved: set[str] = set()
+        self._graph = graph if graph is not None else build_graph()
         self._jobs_dir = ensure_dir(SETTINGS.data_root / "jobs")
         self._load_jobs_from_disk()
+        JOBS.collector = self._status_samples
 
-    def create_job(self, topic: str) -> JobRecord:
+    def create_job(self, topic: str, regenerate_script: bool = False, profile: bool = False) -> JobRecord:
+        self._check_resources()
         now = datetime.now(timezone.utc)
         job_id = f"job-{uuid.uuid4().hex[:10]}"
         record = JobRecord(
@@ -57,11 +86,14 @@ class JobStore:
                 "attribution": [],
                 "errors": [],
                 "max_asset_attempts": 3,
+                "regenerate_script": regenerate_script,
+                "profile": profile or random.random() < SETTINGS.profile_sample_rate,
                 "assets_dir": str(SETTINGS.assets_root),
                 "output_dir": str(SETTINGS.output_root),
             },
         )
         with self._lock:
+            self._reserve_place(job_id)
             self._jobs[job_id] = record
         self._persist(record)
         return record
@@ -70,9 +102,11 @@ class JobStore:
         with self._lock:
             if job_id not in self._jobs:
                 raise KeyError(job_id)
-            self._jobs[job_id].status = "running"
-            self._jobs[job_id].updated_at = datetime.now(timezone.utc)
-        self._spawn(job_id, resume_payload=None)
+            self._reserved.discard(job_id)
+            if self._jobs[job_id].status == "cancelled":
+                return
+            self._enqueue(self._jobs[job_id], resume_payload=None)
+        self._dispatch()
 
     def resume_job(self, job_id: str, review_payload: dict[str, Any]) -> None:
         with self._lock:
@@ -81,10 +115,38 @@ class JobStore:
             record = self._jobs[job_id]
             if record.status != "waiting_review":
                 raise ValueError(f"job {job_id} is not waiting_review.")
-            record.status = "running"
             record.review_payload = None
-            record.updated_at = datetime.now(timezone.utc)
-        self._spawn(job_id, resume_payload=review_payload)
+            # Resumes are never rejected (the job already holds work) but still wait for a slot.
+            self._enqueue(record, resume_payload=review_payload)
+        self._dispatch()
+
+    def cancel_job(self, job_id: str) -> JobRecord:
+        """Stop a queued, running or waiting job.
+
+        A running graph is cancelled cooperatively: the current node aborts at
+        its next checkpoint (ffmpeg children are killed, downloads closed) and
+        the worker records the job as cancelled when the run unwinds.
+        """
+        with self._lock:
+            record = self._jobs.get(job_id)
+            if record is None:
+                raise KeyError(job_id)
+            if record.status in {"completed", "failed", "cancelled"}:
+                raise ValueError(f"job {job_id} is already {record.status}.")
+            queued = next((item for item in self._queue if item[0] == job_id), None)
+            if record.status == "waiting_review" or queued is not None or job_id in self._reserved:
+                # No worker holds this job; the paused checkpoint is simply never resumed.
+                if queued is not None:
+                    self._queue.remove(queued)
+                self._reserved.discard(job_id)
+                self._mark_cancelled(record)
+                self._persist(record)
+                return JobRecord(**asdict(record))
+            self._cancel_requested.add(job_id)
+            control = job_control(job_id)
+        if control is not None:
+            control.cancel(CANCEL_REASON, "cancelled")
+        return self.get_job(job_id) or record
 
     def get_job(self, job_id: str) -> JobRecord | None:
         with self._lock:
@@ -98,6 +160,76 @@ class JobStore:
             rows = [JobRecord(**asdict(r)) for r in self._jobs.values()]
         return sorted(rows, key=lambda r: r.created_at, reverse=True)
 
+    def queue_positions(self) -> dict[str, int]:
+        """1-based position of every job waiting for a worker slot."""
+        with self._lock:
+            return {job_id: idx for idx, (job_id, _) in enumerate(self._queue, start=1)}
+
+    def admission_snapshot(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "active_jobs": len(self._active),
+                "max_active_jobs": SETTINGS.max_active_jobs,
+                "queued_jobs": len(self._queue),
+                "reserved_jobs": len(self._reserved),
+                "max_queued_jobs": SETTINGS.max_queued_jobs,
+            }
+
+    def _check_resources(self) -> None:
+        """Refuse new work while ``DATA_ROOT`` disk or available memory is below its threshold."""
+        if SETTINGS.min_free_disk_mb > 0:
+            disk_mb = free_disk_mb(SETTINGS.data_root)
+            if disk_mb is not None and disk_mb < SETTINGS.min_free_disk_mb:
+                self._reject("low_disk", f"only {disk_mb:.0f}MB free in {SETTINGS.data_root}")
+        if SETTINGS.min_free_memory_mb > 0:
+            memory_mb = available_memory_mb()
+            if memory_mb is not None and memory_mb < SETTINGS.min_free_memory_mb:
+                self._reject("low_memory", f"only {memory_mb:.0f}MB memory available")
+
+    def _reserve_place(self, job_id: str) -> None:
+        """Hold a slot or queue place for a new job; the caller holds ``_lock``."""
+        if SETTINGS.max_active_jobs > 0:
+            free_slots = max(0, SETTINGS.max_active_jobs - len(self._active))
+            waiting = len(self._queue) + len(self._reserved) - free_slots
+            if waiting >= SETTINGS.max_queued_jobs:
+                self._reject("queue_full", f"job queue is full ({waiting} waiting)")
+        self._reserved.add(job_id)
+
+    @staticmethod
+    def _reject(reason: str, detail: str) -> None:
+        ADMISSION_REJECTED.inc(reason=reason)
+        logger.warning("Rejected job submission ({}): {}", reason, detail)
+        raise AdmissionRejected(reason, detail, SETTINGS.admission_retry_after_s)
+
+    def _enqueue(self, record: JobRecord, resume_payload: dict[str, Any] | None) -> None:
+        record.status = "queued"
+        record.updated_at = datetime.now(timezone.utc)
+        self._queue.append((record.job_id, resume_payload))
+
+    def _dispatch(self) -> None:
+        """Start queued runs while worker slots are free."""
+        starting: list[tuple[str, dict[str, Any] | None]] = []
+        with self._lock:
+            while self._queue and (SETTINGS.max_active_jobs <= 0 or len(self._active) < SETTINGS.max_active_jobs):
+                job_id, resume_payload = self._queue.popleft()
+                record = self._jobs[job_id]
+                record.status = "running"
+                record.updated_at = datetime.now(timezone.utc)
+                self._active.add(job_id)
+                starting.append((job_id, resume_payload))
+        for job_id, resume_payload in starting:
+            self._spawn(job_id, resume_payload)
+
+    def profile_path(self, job_id: str) -> Path:
+        return self._jobs_dir / f"{job_id}.profile.folded"
+
+    def _status_samples(self) -> list[tuple[dict[str, str], float]]:
+        counts = {status: 0 for status in ("queued", "running", "waiting_review", "completed", "failed", "cancelled")}
+        with self._lock:
+            for record in self._jobs.values():
+                counts[record.status] = counts.get(record.status, 0) + 1
+        return [({"status": status}, count) for status, count in counts.items()]
+
     def _load_jobs_from_disk(self) -> None:
         files = sorted(self._jobs_dir.glob("job-*.json"))
         if not files:
@@ -108,8 +240,8 @@ class JobStore:
                 raw = json.loads(file_path.read_text(encoding="utf-8"))
                 status = str(raw.get("status", "failed"))
                 state = dict(raw.get("state", {}))
-                # A previously running in-memory worker is gone after restart.
-                if status == "running":
+                # A previously running in-memory worker (or queued run) is gone after restart.
+                if status in {"running", "queued"}:
                     status = "failed"
                     errors = list(state.get("errors", []))
                     errors.append("interrupted by server restart")
@@ -127,6 +259,7 @@ class JobStore:
                     state=state,
                     review_payload=raw.get("review_payload"),
                     error=raw.get("error"),
+                    run_s=float(raw.get("run_s", 0.0)),
                 )
                 self._jobs[record.job_id] = record
                 restored += 1
@@ -151,13 +284,53 @@ class JobStore:
                 return
             state = dict(record.state)
             config = {"configurable": {"thread_id": record.thread_id}}
+            spent_s = record.run_s
 
+        started = time.monotonic()
+        try:
+            with run_control(job_id, SETTINGS.job_deadline_s, SETTINGS.node_deadlines, spent_s) as control:
+                with self._lock:
+                    if job_id in self._cancel_requested:
+                        control.cancel(CANCEL_REASON, "cancelled")
+                if not state.get("profile"):
+                    self._invoke(job_id, state, config, resume_payload)
+                    return
+                interval_s = SETTINGS.profile_interval_ms / 1000
+                with profile_job(job_id, self.profile_path(job_id), interval_s) as profiler:
+                    self._invoke(job_id, state, config, resume_payload)
+        finally:
+            with self._lock:
+                self._cancel_requested.discard(job_id)
+                self._active.discard(job_id)
+                record = self._jobs[job_id]
+                record.run_s = round(spent_s + time.monotonic() - started, 3)
+                self._persist(record)
+            self._dispatch()
+        with self._lock:
+            record = self._jobs[job_id]
+            record.state = {
+                **record.state,
+                "profile_summary": {
+                    "samples": sum(profiler.samples.values()),
+                    "interval_ms": SETTINGS.profile_interval_ms,
+                    "by_node": profiler.by_node(),
+                },
+            }
+            self._persist(record)
+
+    def _invoke(
+        self,
+        job_id: str,
+        state: dict[str, Any],
+        config: dict[str, Any],
+        resume_payload: dict[str, Any] | None,
+    ) -> None:
         try:
             logger.info("Running job {} (resume={})", job_id, bool(resume_payload))
             if resume_payload is None:
                 result = retry_call(
                     f"graph_invoke:{job_id}",
-                    lambda: self._graph.invoke(state, config=config),
+                    lambda: self._graph.invoke(graph_input(state), config=config),
                     max_attempts=2,
                 )
             else:
@@ -182,10 +355,15 @@ class JobStore:
                     status = str(result.get("status", ""))
                     if next_action == "complete" or status == "completed":
                         record.status = "completed"
+                    elif status == "failed:cancelled":
+                        record.status = "cancelled"
                     elif next_action == "failed" or status.startswith("failed"):
                         record.status = "failed"
                     else:
                         record.status = "running"
+                if job_id in self._cancel_requested:
+                    # Cancelled while the run was already unwinding (or pausing for review).
+                    self._mark_cancelled(record)
                 record.error = None
                 self._persist(record)
         except Exception as exc:  # noqa: BLE001
@@ -202,8 +380,22 @@ class JobStore:
                 state["status"] = "failed:runner"
                 state["next_action"] = "failed"
                 record.state = state
+                if job_id in self._cancel_requested:
+                    self._mark_cancelled(record)
                 self._persist(record)
 
+    @staticmethod
+    def _mark_cancelled(record: JobRecord) -> None:
+        state = dict(record.state)
+        if state.get("status") != "failed:cancelled":
+            state["errors"] = [*state.get("errors", []), CANCEL_REASON]
+        state["status"] = "failed:cancelled"
+        state["next_action"] = "failed"
+        record.state = state
+        record.status = "cancelled"
+        record.review_payload = None
+        record.updated_at = datetime.now(timezone.utc)
+
     @staticmethod
     def _extract_interrupt_payload(result: dict[str, Any]) -> dict[str, Any]:
         interrupts = result.get("__interrupt__", [])
@@ -226,6 +418,7 @@ class JobStore:
             "updated_at": record.updated_at.isoformat(),
             "review_payload": record.review_payload,
             "error": record.error,
+            "run_s": record.run_s,
             "state": record.state,
         }
         path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
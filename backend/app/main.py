@@ -7,14 +7,20 @@ from pathlib import Path
 import uvicorn
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import FileResponse, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 from loguru import logger
 
 from .config import SETTINGS
-from .job_store import JobStore
+from .job_store import AdmissionRejected, JobRecord, JobStore
 from .logging_setup import configure_logging
+from .metrics import REGISTRY
 from .models import JobCreateRequest, JobDetail, JobSummary, LibraryItem, ReviewRequest
-from .system import check_media_dependencies
+from .pipeline.cache import cache_stats
+from .pipeline.music_catalog import music_catalog
+from .pipeline.render import RENDER_BUDGET, render_progress, resource_snapshot
+from .pipeline.utils import ensure_dir
+from .system import capacity_snapshot, check_media_dependencies
 
 configure_logging(SETTINGS.logs_root)
 
@@ -29,6 +35,8 @@ app.add_middleware(
 app.mount("/media", StaticFiles(directory=str(SETTINGS.data_root)), name="media")
 
 store = JobStore()
+# Index the music library up front so the first jobs do not wait on a large scan.
+music_catalog(SETTINGS.assets_root / "music", ensure_dir(SETTINGS.assets_root / "cache" / "music"), wait_s=0)
 dependency_snapshot = check_media_dependencies()
 if dependency_snapshot["overall"] == "fail":
     logger.error("Critical media dependencies missing: {}", dependency_snapshot)
@@ -49,13 +57,26 @@ def _path_to_media_url(local_path: str | None) -> str | None:
     return f"/media/{rel.as_posix()}"
 
 
+def _summary(record: JobRecord, positions: dict[str, int]) -> JobSummary:
+    return JobSummary(
+        job_id=record.job_id,
+        topic=record.topic,
+        status=record.status,
+        created_at=record.created_at,
+        updated_at=record.updated_at,
+        queue_position=positions.get(record.job_id),
+    )
+
+
 def _serialize_state(state: dict) -> dict:
     out = dict(state)
-    for key in ["final_video", "audio_narration", "bg_music", "metadata_path"]:
+    for key in ["final_video", "preview_video", "audio_narration", "bg_music", "metadata_path"]:
         if key in out:
             out[f"{key}_url"] = _path_to_media_url(out.get(key))
     out["clips_urls"] = [_path_to_media_url(p) for p in out.get("clips", [])]
     out["images_urls"] = [_path_to_media_url(p) for p in out.get("images", [])]
+    # Live only while video_assembler/final_render is encoding; never persisted.
+    out["render_progress"] = render_progress(str(out.get("job_id", "")))
     return out
 
 
@@ -64,40 +85,51 @@ def health() -> dict:
     return {"status": "ok", "time": datetime.utcnow().isoformat() + "Z"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics() -> PlainTextResponse:
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 @app.get("/api/system/dependencies")
 def system_dependencies() -> dict:
     return check_media_dependencies()
 
 
+@app.get("/api/system/render-resources")
+def render_resources() -> dict:
+    return {
+        **resource_snapshot(),
+        "memory": RENDER_BUDGET.snapshot(),
+        "capacity": {**capacity_snapshot(SETTINGS.data_root), **store.admission_snapshot()},
+    }
+
+
+@app.get("/api/system/caches")
+def cache_metrics() -> dict:
+    return cache_stats()
+
+
 @app.post("/api/jobs", response_model=JobSummary)
 def create_job(payload: JobCreateRequest) -> JobSummary:
     topic = payload.topic.strip()
     if not topic:
         raise HTTPException(status_code=400, detail="topic must not be empty")
-    record = store.create_job(topic)
+    try:
+        record = store.create_job(topic, regenerate_script=payload.regenerate_script, profile=payload.profile)
+    except AdmissionRejected as exc:
+        raise HTTPException(
+            status_code=429,
+            detail=f"{exc.reason}: {exc}",
+            headers={"Retry-After": str(exc.retry_after_s)},
+        ) from exc
     store.start_job(record.job_id)
-    return JobSummary(
-        job_id=record.job_id,
-        topic=record.topic,
-        status=record.status,
-        created_at=record.created_at,
-        updated_at=record.updated_at,
-    )
+    return _summary(record, store.queue_positions())
 
 
 @app.get("/api/jobs", response_model=list[JobSummary])
 def list_jobs() -> list[JobSummary]:
-    rows = store.list_jobs()
-    return [
-        JobSummary(
-            job_id=r.job_id,
-            topic=r.topic,
-            status=r.status,
-            created_at=r.created_at,
-            updated_at=r.updated_at,
-        )
-        for r in rows
-    ]
+    positions = store.queue_positions()
+    return [_summary(r, positions) for r in store.list_jobs()]
 
 
 @app.get("/api/jobs/{job_id}", response_model=JobDetail)
@@ -114,10 +146,22 @@ def get_job(job_id: str) -> JobDetail:
         updated_at=record.updated_at,
         review_payload=record.review_payload,
         state=_serialize_state(record.state),
+        queue_position=store.queue_positions().get(record.job_id),
         error=record.error,
     )
 
 
+@app.get("/api/jobs/{job_id}/profile")
+def get_job_profile(job_id: str) -> FileResponse:
+    """Folded stacks (one ``node:<name>;frame;... count`` line each) for flamegraph.pl or speedscope."""
+    if not store.get_job(job_id):
+        raise HTTPException(status_code=404, detail="job not found")
+    path = store.profile_path(job_id)
+    if not path.exists():
+        raise HTTPException(status_code=404, detail="no profile recorded for this job")
+    return FileResponse(path, media_type="text/plain; charset=utf-8", filename=path.name)
+
+
 @app.post("/api/jobs/{job_id}/review", response_model=JobSummary)
 def review_job(job_id: str, payload: ReviewRequest) -> JobSummary:
     review_payload = {
@@ -132,13 +176,18 @@ def review_job(job_id: str, payload: ReviewRequest) -> JobSummary:
         raise HTTPException(status_code=409, detail=str(exc)) from exc
     record = store.get_job(job_id)
     assert record is not None
-    return JobSummary(
-        job_id=record.job_id,
-        topic=record.topic,
-        status=record.status,
-        created_at=record.created_at,
-        updated_at=record.updated_at,
-    )
+    return _summary(record, store.queue_positions())
+
+
+@app.post("/api/jobs/{job_id}/cancel", response_model=JobSummary)
+def cancel_job(job_id: str) -> JobSummary:
+    try:
+        record = store.cancel_job(job_id)
+    except KeyError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+    return _summary(record, store.queue_positions())
 
 
 @app.get("/api/library", response_model=list[LibraryItem])
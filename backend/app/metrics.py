@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import bisect
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterable, Iterator
+
+LabelValues = tuple[str, ...]
+# Returns (labels, value) pairs computed at scrape time.
+Collector = Callable[[], Iterable[tuple[dict[str, str], float]]]
+
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labelnames: Iterable[str] = ()) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self.collector: Collector | None = None
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def _samples(self) -> list[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        if self.collector is not None:
+            for labels, value in self.collector():
+                lines.append(f"{self.name}{_format_labels(self.labelnames, self._key(labels))} {_format_value(value)}")
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Iterable[str] = ()) -> None:
+        super().__init__(name, help_text, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in items]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: non-cumulative bucket counts (+Inf last), sum, count.
+        self._series: dict[LabelValues, tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, totals = self._series.setdefault(key, ([0] * (len(self.buckets) + 1), [0.0, 0.0]))
+            counts[index] += 1
+            totals[0] += value
+            totals[1] += 1
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            series = sorted((k, (list(c), list(t))) for k, (c, t) in self._series.items())
+        lines: list[str] = []
+        names = self.labelnames + ("le",)
+        for key, (counts, (total, count)) in series:
+            running = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                running += bucket_count
+                lines.append(f"{self.name}_bucket{_format_labels(names, key + (_format_value(bound),))} {running}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {int(count)}")
+        return lines
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: list[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(metric.render() for metric in self._metrics) + "\n"
+
+
+REGISTRY = Registry()
+
+NODE_SECONDS = REGISTRY.register(
+    Histogram("yt_node_duration_seconds", "Wall time of one graph node run.", ["node", "outcome"])
+)
+NODES_ACTIVE = REGISTRY.register(Gauge("yt_nodes_active", "Graph nodes currently executing.", ["node"]))
+PROVIDER_SECONDS = REGISTRY.register(
+    Histogram(
+        "yt_provider_call_duration_seconds",
+        "Wall time of one external call (search, download, LLM, TTS, encode).",
+        ["provider", "outcome"],
+    )
+)
+RENDER_ENCODE_FPS = REGISTRY.register(
+    Histogram(
+        "yt_render_encode_fps",
+        "Average frames per second of one render's encoding phase.",
+        ["profile", "engine"],
+        buckets=(1.0, 2.5, 5.0, 10.0, 15.0, 24.0, 30.0, 45.0, 60.0, 90.0, 120.0, 240.0),
+    )
+)
+JOBS = REGISTRY.register(Gauge("yt_jobs", "Jobs known to the job store by status.", ["status"]))
+DEADLINES_EXPIRED = REGISTRY.register(
+    Counter("yt_deadlines_expired_total", "Node or job deadlines enforced by the watchdog.", ["scope", "node"])
+)
+RECLAIMED = REGISTRY.register(
+    Counter(
+        "yt_reclaimed_total",
+        "Workers, subprocesses and downloads freed by deadlines or cancellation.",
+        ["resource", "reason"],
+    )
+)
+ADMISSION_REJECTED = REGISTRY.register(
+    Counter("yt_admission_rejected_total", "Job submissions refused with 429.", ["reason"])
+)
+CACHE_LOOKUPS = REGISTRY.register(Counter("yt_cache_lookups_total", "Cache lookups by outcome.", ["cache", "outcome"]))
+CACHE_HIT_RATIO = REGISTRY.register(Gauge("yt_cache_hit_ratio", "Hits over hits+misses+expired.", ["cache"]))
+
+
+@contextmanager
+def track_call(provider: str) -> Iterator[None]:
+    """Time an external call into ``yt_provider_call_duration_seconds``."""
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        PROVIDER_SECONDS.observe(time.perf_counter() - started, provider=provider, outcome=outcome)
@@ -8,6 +8,8 @@ from pydantic import BaseModel, Field
 
 class JobCreateRequest(BaseModel):
     topic: str = Field(min_length=2, max_length=200)
+    regenerate_script: bool = False
+    profile: bool = False
 
 
 class ReviewRequest(BaseModel):
@@ -21,6 +23,7 @@ class JobSummary(BaseModel):
     status: str
     created_at: datetime
     updated_at: datetime
+    queue_position: int | None = None
 
 
 class JobDetail(BaseModel):
@@ -31,6 +34,7 @@ class JobDetail(BaseModel):
     created_at: datetime
     updated_at: datetime
     state: dict[str, Any]
+    queue_position: int | None = None
     review_payload: dict[str, Any] | None = None
     error: str | None = None
 
@@ -1,4 +1,4 @@
-from .graph import build_graph
+from .graph import build_graph, graph_input
 from .state import ShortState
 
-__all__ = ["ShortState", "build_graph"]
+__all__ = ["ShortState", "build_graph", "graph_input"]
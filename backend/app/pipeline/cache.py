@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from pathlib import Path
+from typing import Any
+
+from ..metrics import CACHE_HIT_RATIO, CACHE_LOOKUPS
+from .state import ShortState
+from .utils import ensure_dir
+
+_DIGEST_LOCK = threading.Lock()
+_DIGESTS: dict[tuple[str, int, int], str] = {}
+
+
+def file_digest(path: str | Path) -> str:
+    """Content hash of a file, memoized per (path, mtime, size)."""
+    p = Path(path)
+    stat = p.stat()
+    memo_key = (str(p.resolve()), stat.st_mtime_ns, stat.st_size)
+    with _DIGEST_LOCK:
+        cached = _DIGESTS.get(memo_key)
+    if cached:
+        return cached
+    h = hashlib.sha256()
+    with p.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    digest = h.hexdigest()
+    with _DIGEST_LOCK:
+        _DIGESTS[memo_key] = digest
+    return digest
+
+
+def cache_key(*parts: Any) -> str:
+    payload = json.dumps(parts, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+def cache_dir(state: ShortState, name: str) -> Path:
+    return ensure_dir(Path(state.get("assets_dir", "data/assets")) / "cache" / name)
+
+
+_STATS_LOCK = threading.Lock()
+_STATS: dict[str, dict[str, int]] = {}
+
+
+def record_lookup(name: str, outcome: str) -> None:
+    """Count a cache lookup outcome (``hit``, ``miss``, ``expired``, ``bypass``) for ``name``."""
+    with _STATS_LOCK:
+        counters = _STATS.setdefault(name, {"hit": 0, "miss": 0, "expired": 0, "bypass": 0})
+        counters[outcome] = counters.get(outcome, 0) + 1
+
+
+def cache_stats() -> dict[str, dict[str, Any]]:
+    with _STATS_LOCK:
+        snapshot = {name: dict(counters) for name, counters in _STATS.items()}
+    for counters in snapshot.values():
+        lookups = counters["hit"] + counters["miss"] + counters["expired"]
+        counters["hit_ratio"] = round(counters["hit"] / lookups, 3) if lookups else 0.0
+    return snapshot
+
+
+def _lookup_samples():
+    for name, counters in cache_stats().items():
+        for outcome in ("hit", "miss", "expired", "bypass"):
+            yield {"cache": name, "outcome": outcome}, counters[outcome]
+
+
+CACHE_LOOKUPS.collector = _lookup_samples
+CACHE_HIT_RATIO.collector = lambda: [({"cache": name}, c["hit_ratio"]) for name, c in cache_stats().items()]
+
+
+def input_fingerprint(*parts: Any) -> str:
+    """Fingerprint of a node's inputs; file paths should be passed through ``file_stamp``."""
+    return cache_key("inputs", *parts)
+
+
+def file_stamp(path: str | Path | None) -> tuple[str, int, int] | None:
+    if not path:
+        return None
+    try:
+        stat = Path(path).stat()
+    except OSError:
+        return None
+    return (str(path), stat.st_mtime_ns, stat.st_size)
+
+
+def is_unchanged(state: ShortState, node: str, fingerprint: str, *outputs: str | None) -> bool:
+    """True when ``node`` last succeeded on the same inputs and its outputs still exist."""
+    if state.get("fingerprints", {}).get(node) != fingerprint:
+        return False
+    return all(output and Path(output).exists() for output in outputs)
+
+
+def record_fingerprint(state: ShortState, node: str, fingerprint: str) -> None:
+    state["fingerprints"] = {**state.get("fingerprints", {}), node: fingerprint}
@@ -0,0 +1,346 @@
+from __future__ import annotations
+
+import socket
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator
+
+from loguru import logger
+
+from ..metrics import DEADLINES_EXPIRED, RECLAIMED
+from ..profiling import adopt_thread, current_label
+
+WATCHDOG_INTERVAL_S = 0.5
+# Grace period between SIGTERM and SIGKILL for registered subprocesses.
+KILL_GRACE_S = 2.0
+
+_local = threading.local()
+
+
+class JobCancelled(RuntimeError):
+    """Raised at a checkpoint once the job (or the running node) has been cancelled."""
+
+    def __init__(self, reason: str, kind: str) -> None:
+        super().__init__(reason)
+        self.reason = reason
+        self.kind = kind
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # Crosses process boundaries when a render pool worker reports its window cancelled.
+        return (type(self), (self.reason, self.kind))
+
+
+@dataclass
+class _NodeRun:
+    name: str
+    deadline: float | None
+    expired: str | None = None
+    processes: set[subprocess.Popen] = field(default_factory=set)
+    responses: set[Any] = field(default_factory=set)
+
+
+class JobControl:
+    """Cancellation token, deadlines and in-flight work of one graph run.
+
+    ``cancel`` is sticky for the whole run; ``expire_node`` only aborts the
+    node that overran, so its own retry transition can take over. Either way
+    registered subprocesses are killed and streaming responses closed. Work
+    that outlives the node starting it registers against the run itself (see
+    ``job_context``), which only a job-level cancel aborts.
+    """
+
+    def __init__(
+        self,
+        job_id: str,
+        deadline_s: float = 0.0,
+        node_deadlines: dict[str, float] | None = None,
+        spent_s: float = 0.0,
+    ) -> None:
+        self.job_id = job_id
+        self.started = time.monotonic()
+        # ``spent_s`` is run time used by earlier runs of the same job (before a review pause).
+        self.deadline_s = deadline_s
+        self.deadline = self.started + deadline_s - spent_s if deadline_s > 0 else None
+        self.node_deadlines = dict(node_deadlines or {})
+        self.reason: str | None = None
+        self.kind: str | None = None
+        self._lock = threading.Lock()
+        self._nodes: dict[str, _NodeRun] = {}
+        self._run = _NodeRun("", None)
+
+    @property
+    def cancelled(self) -> bool:
+        return self.reason is not None
+
+    @contextmanager
+    def node(self, name: str) -> Iterator[None]:
+        """Scope one node run on the current thread, arming its deadline."""
+        limit = self.node_deadlines.get(name, 0.0)
+        run = _NodeRun(name, time.monotonic() + limit if limit > 0 else None)
+        with self._lock:
+            self._nodes[name] = run
+        previous = getattr(_local, "scope", None)
+        _local.scope = (self, run)
+        try:
+            yield
+        finally:
+            _local.scope = previous
+            with self._lock:
+                if self._nodes.get(name) is run:
+                    del self._nodes[name]
+
+    def rearm(self, name: str) -> None:
+        """Give the running node ``name`` a fresh deadline, for retries it performs in place."""
+        limit = self.node_deadlines.get(name, 0.0)
+        with self._lock:
+            run = self._nodes.get(name)
+            if run is None:
+                return
+            run.deadline = time.monotonic() + limit if limit > 0 else None
+            run.expired = None
+
+    def check(self, run: _NodeRun | None = None) -> None:
+        if self.reason is not None:
+            raise JobCancelled(self.reason, self.kind or "cancelled")
+        if run is not None and run.expired is not None:
+            raise JobCancelled(run.expired, "node_deadline")
+
+    def cancel(self, reason: str, kind: str = "cancelled") -> bool:
+        """Cancel the whole run; returns False if it was already cancelled."""
+        with self._lock:
+            if self.reason is not None:
+                return False
+            self.reason, self.kind = reason, kind
+            runs = [*self._nodes.values(), self._run]
+        logger.warning("Job {} cancelled ({}): {}", self.job_id, kind, reason)
+        for run in runs:
+            self._abort(run, kind)
+        return True
+
+    def expire_node(self, name: str) -> None:
+        with self._lock:
+            run = self._nodes.get(name)
+            if run is None or run.expired is not None:
+                return
+            run.expired = f"{name} exceeded its {self.node_deadlines.get(name, 0):g}s deadline"
+        logger.warning("Job {}: {}", self.job_id, run.expired)
+        DEADLINES_EXPIRED.inc(scope="node", node=name)
+        self._abort(run, "node_deadline")
+
+    def _abort(self, run: _NodeRun, kind: str) -> None:
+        with self._lock:
+            processes, responses = list(run.processes), list(run.responses)
+        for response in responses:
+            _close_response(response)
+            RECLAIMED.inc(resource="download", reason=kind)
+        for process in processes:
+            if process.poll() is None:
+                _kill_async(process)
+                RECLAIMED.inc(resource="process", reason=kind)
+
+    def expired_nodes(self, now: float) -> list[str]:
+        with self._lock:
+            return [
+                run.name
+                for run in self._nodes.values()
+                if run.deadline is not None and run.expired is None and now > run.deadline
+            ]
+
+    def abort_state(self, state: dict[str, Any], node: str) -> dict[str, Any]:
+        """Route ``state`` to the graph's failure transition after a job-level cancel."""
+        errors = list(state.get("errors", []))
+        errors.append(f"{node}: {self.reason}")
+        return {**state, "errors": errors, "status": f"failed:{self.kind}", "next_action": "failed"}
+
+
+def _close_response(response: Any) -> None:
+    """Close a streaming ``requests`` response, waking a thread blocked reading it.
+
+    ``close()`` alone does not interrupt a ``recv`` in progress on another
+    thread, so the socket is shut down first; the reader then sees EOF.
+    """
+    fp = getattr(getattr(response, "raw", None), "_fp", None)
+    sock = getattr(getattr(getattr(fp, "fp", None), "raw", None), "_sock", None)
+    try:
+        if sock is not None:
+            sock.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        pass
+    try:
+        response.close()
+    except Exception:  # noqa: BLE001
+        pass
+
+
+def _kill(process: subprocess.Popen) -> None:
+    try:
+        process.terminate()
+        process.wait(timeout=KILL_GRACE_S)
+    except subprocess.TimeoutExpired:
+        process.kill()
+    except OSError:
+        pass
+
+
+def _kill_async(process: subprocess.Popen) -> None:
+    """SIGTERM now; escalate to SIGKILL from a reaper thread so the caller (the watchdog) never waits."""
+    try:
+        process.terminate()
+    except OSError:
+        return
+    threading.Thread(target=_kill, args=(process,), daemon=True, name=f"reap-{process.pid}").start()
+
+
+def current_scope() -> tuple[JobControl, _NodeRun] | None:
+    return getattr(_local, "scope", None)
+
+
+def scope_pids() -> Callable[[], list[int]] | None:
+    """Live PIDs of the processes registered by the calling thread's node, readable from any thread."""
+    scope = current_scope()
+    if scope is None:
+        return None
+    control, run = scope
+
+    def pids() -> list[int]:
+        with control._lock:
+            return [process.pid for process in run.processes if process.poll() is None]
+
+    return pids
+
+
+def checkpoint() -> None:
+    """Raise ``JobCancelled`` if the calling thread's job or node was cancelled (no-op outside a job)."""
+    scope = current_scope()
+    if scope is not None:
+        scope[0].check(scope[1])
+
+
+@contextmanager
+def tracked_process(process: subprocess.Popen) -> Iterator[subprocess.Popen]:
+    """Kill ``process`` if the calling thread's job or node is cancelled while it runs."""
+    scope = current_scope()
+    if scope is None:
+        yield process
+        return
+    control, run = scope
+    with control._lock:
+        run.processes.add(process)
+    try:
+        if control.cancelled or run.expired:
+            _kill(process)
+        yield process
+    finally:
+        with control._lock:
+            run.processes.discard(process)
+
+
+def run_tracked(command: list[str], timeout: float, capture_stdout: bool = True) -> subprocess.CompletedProcess:
+    """``subprocess.run(..., text=True)`` with captured output whose process a cancel or deadline can kill."""
+    process = subprocess.Popen(
+        command,
+        stdout=subprocess.PIPE if capture_stdout else subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    with tracked_process(process):
+        try:
+            stdout, stderr = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.communicate()
+            raise
+    return subprocess.CompletedProcess(command, process.returncode, stdout or "", stderr or "")
+
+
+@contextmanager
+def tracked_response(response: Any) -> Iterator[Any]:
+    """Close a streaming HTTP response if the calling thread's job or node is cancelled."""
+    scope = current_scope()
+    if scope is None:
+        yield response
+        return
+    control, run = scope
+    with control._lock:
+        run.responses.add(response)
+    try:
+        yield response
+    finally:
+        with control._lock:
+            run.responses.discard(response)
+
+
+def job_context(node_scoped: bool = True) -> tuple[Any, ...]:
+    """What a worker pool created inside a node should inherit (profiler label, cancellation scope).
+
+    With ``node_scoped=False`` the pool's work is tied to the job rather than
+    the calling node, for background work that keeps running after the node
+    returns; it is still aborted by a cancel or job deadline.
+    """
+    scope = current_scope()
+    if scope is not None and not node_scoped:
+        scope = (scope[0], scope[0]._run)
+    return current_label(), scope
+
+
+def adopt_job_context(context: tuple[Any, ...]) -> None:
+    """ThreadPoolExecutor initializer pairing with ``job_context``."""
+    label, scope = context
+    adopt_thread(label)
+    _local.scope = scope
+
+
+_CONTROLS_LOCK = threading.Lock()
+_CONTROLS: dict[str, JobControl] = {}
+_WATCHDOG: threading.Thread | None = None
+
+
+def _watchdog() -> None:
+    while True:
+        time.sleep(WATCHDOG_INTERVAL_S)
+        now = time.monotonic()
+        with _CONTROLS_LOCK:
+            controls = list(_CONTROLS.values())
+        for control in controls:
+            # One bad control must not stop deadline enforcement for every other job.
+            try:
+                if control.deadline is not None and now > control.deadline and not control.cancelled:
+                    if control.cancel(f"job exceeded its {control.deadline_s:g}s deadline", "job_deadline"):
+                        DEADLINES_EXPIRED.inc(scope="job", node="")
+                for name in control.expired_nodes(now):
+                    control.expire_node(name)
+            except Exception:  # noqa: BLE001
+                logger.exception("Watchdog failed to enforce deadlines for job {}", control.job_id)
+
+
+@contextmanager
+def run_control(
+    job_id: str,
+    deadline_s: float,
+    node_deadlines: dict[str, float],
+    spent_s: float = 0.0,
+) -> Iterator[JobControl]:
+    """Register a control for one graph run so nodes, the watchdog and cancel requests can find it."""
+    global _WATCHDOG
+    control = JobControl(job_id, deadline_s, node_deadlines, spent_s)
+    with _CONTROLS_LOCK:
+        _CONTROLS[job_id] = control
+        if _WATCHDOG is None:
+            _WATCHDOG = threading.Thread(target=_watchdog, daemon=True, name="job-watchdog")
+            _WATCHDOG.start()
+    try:
+        yield control
+    finally:
+        with _CONTROLS_LOCK:
+            if _CONTROLS.get(job_id) is control:
+                del _CONTROLS[job_id]
+        if control.cancelled:
+            RECLAIMED.inc(resource="worker", reason=control.kind or "cancelled")
+
+
+def job_control(job_id: str | None) -> JobControl | None:
+    with _CONTROLS_LOCK:
+        return _CONTROLS.get(job_id or "")
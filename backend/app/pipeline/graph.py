@@ -1,82 +1,219 @@
 from __future__ import annotations
 
+import time
+from typing import Any, Callable
+
 from langgraph.checkpoint.memory import MemorySaver
 from langgraph.graph import END, StateGraph
 
+from ..metrics import NODE_SECONDS, NODES_ACTIVE
+from ..profiling import node_scope
+from .control import job_control
 from .nodes import (
     asset_finder,
     audio_narration,
     completion_node,
+    final_render,
     human_review,
+    media_join,
     music_selector,
     script_generator,
     video_assembler,
 )
-from .state import ShortState
+from .state import Replace, ShortState
+
+Node = Callable[[ShortState], ShortState]
+
+# Stages that only depend on the script; they run as parallel branches and meet in media_join.
+MEDIA_BRANCHES = ("asset_finder", "audio_narration", "music_selector")
+
+_APPEND_KEYS = ("errors", "attribution")
+_MERGE_KEYS = ("attempts", "branch_results", "fingerprints", "stage_timings")
+
+
+def _detached(state: ShortState) -> dict[str, Any]:
+    # Nodes append to errors/attempts in place; give each one private containers
+    # so parallel branches never mutate the shared checkpoint values.
+    return {
+        key: list(value) if isinstance(value, list) else dict(value) if isinstance(value, dict) else value
+        for key, value in state.items()
+    }
+
+
+def _updates(before: ShortState, after: ShortState) -> dict[str, Any]:
+    """Reduce a node's returned state to the keys it changed.
+
+    Append-only lists are sent as the newly added items (or as a ``Replace``
+    when the node rewrote earlier entries) and merged dicts as the changed
+    entries, matching the reducers declared on ShortState.
+    """
+    update: dict[str, Any] = {}
+    for key, value in after.items():
+        previous = before.get(key)
+        if key in _APPEND_KEYS:
+            previous = list(previous or [])
+            if value[: len(previous)] != previous:
+                update[key] = Replace(value)
+            elif len(value) > len(previous):
+                update[key] = value[len(previous) :]
+        elif key in _MERGE_KEYS:
+            changed = {name: entry for name, entry in value.items() if (previous or {}).get(name) != entry}
+            if changed:
+                update[key] = changed
+        elif key not in before or previous != value:
+            update[key] = value
+    return update
+
+
+def graph_input(state: ShortState) -> ShortState:
+    """Full state for ``invoke``; its lists replace (not extend) a checkpoint left by an earlier attempt."""
+    return {**state, **{key: Replace(state[key]) for key in _APPEND_KEYS if key in state}}
+
+
+def _timed(name: str, fn: Node, state: ShortState) -> ShortState:
+    """Run a node on private containers, recording its wall time in metrics and ``stage_timings``.
+
+    A cancelled run skips the node; a run cancelled while the node worked is
+    routed to ``failed`` instead of the node's own retry transition.
+    """
+    control = job_control(state.get("job_id"))
+    if control is not None and control.cancelled:
+        return control.abort_state(_detached(state), name)
+    NODES_ACTIVE.inc(node=name)
+    started = time.perf_counter()
+    try:
+        with node_scope(state.get("job_id"), name):
+            if control is None:
+                result = fn(_detached(state))
+            else:
+                with control.node(name):
+                    result = fn(_detached(state))
+    finally:
+        NODES_ACTIVE.dec(node=name)
+    elapsed = time.perf_counter() - started
+    if control is not None and control.cancelled:
+        result = control.abort_state(result, name)
+    outcome = "failed" if str(result.get("status", "")).startswith("failed") else "ok"
+    NODE_SECONDS.observe(elapsed, node=name, outcome=outcome)
+    timings = dict(result.get("stage_timings", {}))
+    previous = timings.get(name, {})
+    timings[name] = {
+        "runs": previous.get("runs", 0) + 1,
+        "last_s": round(elapsed, 3),
+        "total_s": round(previous.get("total_s", 0.0) + elapsed, 3),
+    }
+    result["stage_timings"] = timings
+    return result
+
+
+def _node(name: str, fn: Node) -> Callable[[ShortState], dict[str, Any]]:
+    def run(state: ShortState) -> dict[str, Any]:
+        return _updates(state, _timed(name, fn, state))
+
+    return run
+
+
+def _branch(name: str, fn: Node) -> Callable[[ShortState], dict[str, Any]]:
+    """Like ``_node`` but reports status/next_action under ``branch_results`` so branches never collide."""
+
+    def run(state: ShortState) -> dict[str, Any]:
+        result = _timed(name, fn, state)
+        update = _updates(state, result)
+        update.pop("status", None)
+        update.pop("next_action", None)
+        update["branch_results"] = {
+            name: {"status": result.get("status", ""), "next_action": result.get("next_action", "")}
+        }
+        return update
+
+    return run
+
+
+def _find_assets(state: ShortState) -> ShortState:
+    # refine_query used to be a graph loop; inside a parallel branch it is retried in place.
+    control = job_control(state.get("job_id"))
+    state = asset_finder(state)
+    for _ in range(max(0, int(state.get("max_asset_attempts", 3)) - 1)):
+        if state.get("next_action") != "refine_query":
+            break
+        if control is not None:
+            # Each attempt gets the full node deadline; an expired one would fail every retry at once.
+            control.rearm("asset_finder")
+        state = asset_finder(state)
+    return state
+
+
+def _route(*fan_out_on: str) -> Callable[[ShortState], str | list[str]]:
+    def route(state: ShortState) -> str | list[str]:
+        action = state.get("next_action", "failed")
+        return list(MEDIA_BRANCHES) if action in fan_out_on else action
+
+    return route
+
+
+_TO_MEDIA = {name: name for name in MEDIA_BRANCHES}
 
 
 def build_graph(checkpointer: MemorySaver | None = None):
     workflow = StateGraph(ShortState)
-    workflow.add_node("script_generator", script_generator)
-    workflow.add_node("asset_finder", asset_finder)
-    workflow.add_node("audio_narration", audio_narration)
-    workflow.add_node("music_selector", music_selector)
-    workflow.add_node("video_assembler", video_assembler)
-    workflow.add_node("human_review", human_review)
-    workflow.add_node("complete", completion_node)
+    workflow.add_node("script_generator", _node("script_generator", script_generator))
+    workflow.add_node("asset_finder", _branch("asset_finder", _find_assets))
+    workflow.add_node("audio_narration", _branch("audio_narration", audio_narration))
+    workflow.add_node("music_selector", _branch("music_selector", music_selector))
+    workflow.add_node("media_join", _node("media_join", media_join))
+    workflow.add_node("video_assembler", _node("video_assembler", video_assembler))
+    workflow.add_node("human_review", _node("human_review", human_review))
+    workflow.add_node("final_render", _node("final_render", final_render))
+    workflow.add_node("complete", _node("complete", completion_node))
 
     workflow.set_entry_point("script_generator")
 
     workflow.add_conditional_edges(
         "script_generator",
-        lambda s: s.get("next_action", "failed"),
+        _route("find_assets"),
         {
-            "find_assets": "asset_finder",
+            **_TO_MEDIA,
             "needs_script_revision": "script_generator",
             "failed": END,
         },
     )
+    # Waits for all three branches of the same fan-out before joining.
+    workflow.add_edge(list(MEDIA_BRANCHES), "media_join")
     workflow.add_conditional_edges(
-        "asset_finder",
+        "media_join",
         lambda s: s.get("next_action", "failed"),
         {
-            "generate_audio": "audio_narration",
-            "refine_query": "asset_finder",
+            "assemble_video": "video_assembler",
             "needs_script_revision": "script_generator",
             "failed": END,
         },
     )
     workflow.add_conditional_edges(
-        "audio_narration",
+        "video_assembler",
         lambda s: s.get("next_action", "failed"),
         {
-            "select_music": "music_selector",
-            "needs_script_revision": "script_generator",
+            "human_review": "human_review",
+            "reassemble": "video_assembler",
             "failed": END,
         },
     )
     workflow.add_conditional_edges(
-        "music_selector",
-        lambda s: s.get("next_action", "failed"),
-        {"assemble_video": "video_assembler", "failed": END},
-    )
-    workflow.add_conditional_edges(
-        "video_assembler",
-        lambda s: s.get("next_action", "failed"),
+        "human_review",
+        _route("find_more_assets"),
         {
-            "human_review": "human_review",
+            **_TO_MEDIA,
+            "approved": "final_render",
+            "needs_script_revision": "script_generator",
             "reassemble": "video_assembler",
             "failed": END,
         },
     )
     workflow.add_conditional_edges(
-        "human_review",
+        "final_render",
         lambda s: s.get("next_action", "failed"),
         {
-            "approved": "complete",
-            "needs_script_revision": "script_generator",
-            "find_more_assets": "asset_finder",
-            "reassemble": "video_assembler",
+            "finalize": "complete",
+            "render_final": "final_render",
             "failed": END,
         },
     )
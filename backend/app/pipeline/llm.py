@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from ..config import SETTINGS
+from .cache import cache_key, record_lookup
+
+# Bump whenever the script prompt changes so stale cached scripts are not reused.
+PROMPT_VERSION = 1
+SCRIPT_TEMPERATURE = 0.7
+
+_CLIENT_LOCK = threading.Lock()
+_CLIENTS: dict[tuple[str, str, float], Any] = {}
+
+
+def chat_model(temperature: float = SCRIPT_TEMPERATURE) -> Any:
+    """Process-wide ChatOpenAI client, so jobs share one HTTP connection pool."""
+    from langchain_openai import ChatOpenAI
+
+    key = (SETTINGS.openai_model, SETTINGS.openai_base_url, temperature)
+    with _CLIENT_LOCK:
+        client = _CLIENTS.get(key)
+        if client is None:
+            client = ChatOpenAI(
+                api_key=SETTINGS.openai_api_key,
+                model=SETTINGS.openai_model,
+                temperature=temperature,
+                base_url=SETTINGS.openai_base_url or None,
+                # A blocking invoke cannot be interrupted, so bound it by the node's deadline.
+                timeout=SETTINGS.node_deadlines.get("script_generator") or None,
+            )
+            _CLIENTS[key] = client
+        return client
+
+
+def script_cache_key(topic: str, notes: str) -> str:
+    return cache_key("script", PROMPT_VERSION, SETTINGS.openai_model, " ".join(topic.split()), notes.strip())
+
+
+def load_cached_script(cache_root: Path, key: str) -> str | None:
+    """Return a cached script younger than ``SCRIPT_CACHE_TTL_S``, recording the lookup outcome."""
+    if SETTINGS.script_cache_ttl_s <= 0:
+        return None
+    path = cache_root / f"{key}.json"
+    try:
+        entry = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        record_lookup("llm_script", "miss")
+        return None
+    if time.time() - float(entry.get("created_at", 0)) > SETTINGS.script_cache_ttl_s:
+        record_lookup("llm_script", "expired")
+        return None
+    record_lookup("llm_script", "hit")
+    return str(entry.get("script", "")) or None
+
+
+def store_cached_script(cache_root: Path, key: str, script: str, **meta: Any) -> None:
+    if SETTINGS.script_cache_ttl_s <= 0:
+        return
+    path = cache_root / f"{key}.json"
+    tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        tmp.write_text(
+            json.dumps({"created_at": time.time(), "script": script, **meta}, ensure_ascii=False),
+            encoding="utf-8",
+        )
+        os.replace(tmp, path)
+    except OSError as exc:
+        logger.warning("Could not write script cache {}: {}", path.name, exc)
+        tmp.unlink(missing_ok=True)
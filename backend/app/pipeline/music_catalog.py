@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import json
+import os
+import random
+import threading
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from loguru import logger
+
+from .cache import cache_key
+from .render.probe import probe_audio
+
+MUSIC_SUFFIXES = {".mp3", ".wav", ".m4a", ".aac", ".ogg"}
+CATALOG_VERSION = 2
+# Among the tracks long enough, pick from the few shortest so jobs still get some variety.
+SELECTION_WINDOW = 5
+# How long a job waits for a running index before selecting from what is already indexed.
+INDEX_WAIT_S = 2.0
+
+
+@dataclass
+class Track:
+    name: str
+    path: str
+    mtime_ns: int
+    size: int
+    duration_s: float | None = None
+    sample_rate: int | None = None
+
+
+def _scan_track(entry: os.DirEntry) -> Track:
+    stat = entry.stat()
+    info = probe_audio(entry.path)
+    return Track(
+        name=entry.name,
+        path=entry.path,
+        mtime_ns=stat.st_mtime_ns,
+        size=stat.st_size,
+        duration_s=info["duration_s"],
+        sample_rate=info["sample_rate"],
+    )
+
+
+class MusicCatalog:
+    """Persistent index of the music library, sorted by duration.
+
+    ``refresh`` only rescans when the directory changed and only probes files
+    whose size or mtime differ from the stored entry; it runs on a background
+    thread (``refresh_in_background``) so a large first scan never blocks a
+    job. ``select`` is a bisect over the sorted durations indexed so far.
+    """
+
+    def __init__(self, music_dir: Path, index_path: Path) -> None:
+        self.music_dir = music_dir
+        self.index_path = index_path
+        self.version = ""
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._indexer: threading.Thread | None = None
+        self._dir_stamp: int | None = None
+        self._tracks: list[Track] = []
+        self._durations: list[float] = []
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._tracks)
+
+    def _load(self) -> None:
+        try:
+            payload = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if payload.get("version") != CATALOG_VERSION:
+            return
+        self._dir_stamp = payload.get("dir_stamp")
+        self._index([Track(**item) for item in payload.get("tracks", [])])
+
+    def _index(self, tracks: list[Track]) -> None:
+        tracks.sort(key=lambda t: (t.duration_s or 0.0, t.name))
+        self._tracks = tracks
+        self._durations = [t.duration_s or 0.0 for t in tracks]
+        self.version = cache_key([(t.name, t.mtime_ns, t.size) for t in tracks])
+
+    def _save(self) -> None:
+        payload = {
+            "version": CATALOG_VERSION,
+            "dir_stamp": self._dir_stamp,
+            "tracks": [asdict(t) for t in self._tracks],
+        }
+        tmp = self.index_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        os.replace(tmp, self.index_path)
+
+    @property
+    def indexing(self) -> bool:
+        indexer = self._indexer
+        return indexer is not None and indexer.is_alive()
+
+    def refresh_in_background(self) -> threading.Thread:
+        """Start ``refresh`` on a daemon thread unless one is already running; returns that thread."""
+        with self._lock:
+            if self._indexer is None or not self._indexer.is_alive():
+                self._indexer = threading.Thread(target=self._refresh_quietly, daemon=True, name="music-index")
+                self._indexer.start()
+            return self._indexer
+
+    def _refresh_quietly(self) -> None:
+        try:
+            self.refresh()
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Music catalog refresh failed for {}: {}", self.music_dir, exc)
+
+    def refresh(self) -> int:
+        """Sync the index with the directory; returns how many files were (re)probed."""
+        # Probing happens outside ``_lock`` so ``select`` keeps serving the previous index.
+        with self._refresh_lock:
+            try:
+                dir_stamp = self.music_dir.stat().st_mtime_ns
+            except OSError:
+                return 0
+            if dir_stamp == self._dir_stamp:
+                return 0
+            with self._lock:
+                known = {t.name: t for t in self._tracks}
+            kept: list[Track] = []
+            changed: list[os.DirEntry] = []
+            with os.scandir(self.music_dir) as entries:
+                for entry in entries:
+                    if not entry.is_file() or Path(entry.name).suffix.lower() not in MUSIC_SUFFIXES:
+                        continue
+                    stat = entry.stat()
+                    track = known.get(entry.name)
+                    if track and track.mtime_ns == stat.st_mtime_ns and track.size == stat.st_size:
+                        kept.append(track)
+                    else:
+                        changed.append(entry)
+            if changed:
+                with ThreadPoolExecutor(max_workers=4, thread_name_prefix="music-scan") as executor:
+                    kept.extend(executor.map(_scan_track, changed))
+            with self._lock:
+                self._dir_stamp = dir_stamp
+                self._index(kept)
+                self._save()
+            logger.info("Music catalog: {} tracks ({} probed)", len(kept), len(changed))
+            return len(changed)
+
+    def select(self, min_duration_s: float, rng: random.Random | None = None) -> Track | None:
+        """A track at least ``min_duration_s`` long, else the longest one available."""
+        with self._lock:
+            if not self._tracks:
+                return None
+            start = bisect_left(self._durations, min_duration_s)
+            if start >= len(self._tracks):
+                return self._tracks[-1]
+            return (rng or random).choice(self._tracks[start : start + SELECTION_WINDOW])
+
+
+_CATALOGS_LOCK = threading.Lock()
+_CATALOGS: dict[str, MusicCatalog] = {}
+
+
+def music_catalog(music_dir: Path, index_dir: Path, wait_s: float = INDEX_WAIT_S) -> MusicCatalog:
+    """Process-wide catalog for ``music_dir``.
+
+    Every call starts a background refresh against the directory and waits
+    at most ``wait_s`` for it; the server also starts one at startup, so jobs
+    normally find the library already indexed.
+    """
+    with _CATALOGS_LOCK:
+        catalog = _CATALOGS.get(str(music_dir))
+        if catalog is None:
+            catalog = MusicCatalog(music_dir, index_dir / "catalog.json")
+            _CATALOGS[str(music_dir)] = catalog
+    catalog.refresh_in_background().join(timeout=wait_s)
+    return catalog
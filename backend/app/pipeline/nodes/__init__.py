@@ -2,6 +2,8 @@ from .assemble_node import video_assembler
 from .asset_node import asset_finder
 from .audio_node import audio_narration
 from .complete_node import completion_node
+from .final_render_node import final_render
+from .join_node import media_join
 from .music_node import music_selector
 from .review_node import human_review
 from .script_node import script_generator
@@ -10,7 +12,9 @@ __all__ = [
     "asset_finder",
     "audio_narration",
     "completion_node",
+    "final_render",
     "human_review",
+    "media_join",
     "music_selector",
     "script_generator",
     "video_assembler",
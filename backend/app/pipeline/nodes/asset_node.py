@@ -10,6 +10,8 @@ from loguru import logger
 from tqdm import tqdm
 
 from ...config import SETTINGS
+from ...metrics import track_call
+from ..control import JobCancelled, adopt_job_context, checkpoint, job_context, tracked_response
 from ..retry import retry_call
 from ..state import ShortState
 from ..utils import (
@@ -28,13 +30,15 @@ def _search_pexels_images(query: str, per_page: int = 6) -> list[dict[str, str]]
         return []
 
     def _call() -> list[dict[str, str]]:
-        r = requests.get(
-            "https://api.pexels.com/v1/search",
-            headers={"Authorization": SETTINGS.pexels_api_key},
-            params={"query": query, "per_page": per_page},
-            timeout=20,
-        )
-        r.raise_for_status()
+        checkpoint()
+        with track_call("pexels_search"):
+            r = requests.get(
+                f"{SETTINGS.pexels_base_url}/v1/search",
+                headers={"Authorization": SETTINGS.pexels_api_key},
+                params={"query": query, "per_page": per_page},
+                timeout=20,
+            )
+            r.raise_for_status()
         photos = r.json().get("photos", [])
         out: list[dict[str, str]] = []
         for photo in photos:
@@ -61,13 +65,15 @@ def _search_pexels_videos(query: str, per_page: int = 5) -> list[dict[str, str]]
         return []
 
     def _call() -> list[dict[str, str]]:
-        r = requests.get(
-            "https://api.pexels.com/videos/search",
-            headers={"Authorization": SETTINGS.pexels_api_key},
-            params={"query": query, "per_page": per_page},
-            timeout=20,
-        )
-        r.raise_for_status()
+        checkpoint()
+        with track_call("pexels_search"):
+            r = requests.get(
+                f"{SETTINGS.pexels_base_url}/videos/search",
+                headers={"Authorization": SETTINGS.pexels_api_key},
+                params={"query": query, "per_page": per_page},
+                timeout=20,
+            )
+            r.raise_for_status()
         videos = r.json().get("videos", [])
         out: list[dict[str, str]] = []
         for item in videos:
@@ -97,16 +103,24 @@ def _search_pexels_videos(query: str, per_page: int = 5) -> list[dict[str, str]]
 
 def _download_file(url: str, dest: Path) -> bool:
     def _call() -> bool:
-        r = requests.get(url, stream=True, timeout=40)
-        r.raise_for_status()
-        with dest.open("wb") as f:
-            for chunk in r.iter_content(chunk_size=65536):
-                if chunk:
-                    f.write(chunk)
+        checkpoint()
+        with track_call("pexels_download"):
+            r = requests.get(url, stream=True, timeout=40)
+            r.raise_for_status()
+            with tracked_response(r), dest.open("wb") as f:
+                for chunk in r.iter_content(chunk_size=65536):
+                    checkpoint()
+                    if chunk:
+                        f.write(chunk)
+            # A stream cut short by a cancel ends like a normal EOF.
+            checkpoint()
         return True
 
     try:
         return retry_call(f"download:{dest.name}", _call, max_attempts=3)
+    except JobCancelled:
+        dest.unlink(missing_ok=True)
+        raise
     except Exception:  # noqa: BLE001
         return False
 
@@ -137,13 +151,19 @@ def asset_finder(state: ShortState) -> ShortState:
 
         image_candidates: list[dict[str, str]] = []
         video_candidates: list[dict[str, str]] = []
-        with ThreadPoolExecutor(max_workers=6, thread_name_prefix="asset-search") as executor:
+        with ThreadPoolExecutor(
+            max_workers=6,
+            thread_name_prefix="asset-search",
+            initializer=adopt_job_context,
+            initargs=(job_context(),),
+        ) as executor:
             future_map = {}
             for query in query_subset:
                 future_map[executor.submit(_search_pexels_images, query)] = ("image", query)
                 future_map[executor.submit(_search_pexels_videos, query)] = ("video", query)
 
             for future in as_completed(future_map):
+                checkpoint()
                 kind, query = future_map[future]
                 try:
                     results = future.result()
@@ -166,7 +186,12 @@ def asset_finder(state: ShortState) -> ShortState:
             disable=not sys.stderr.isatty(),
         )
 
-        with ThreadPoolExecutor(max_workers=6, thread_name_prefix="asset-download") as executor:
+        with ThreadPoolExecutor(
+            max_workers=6,
+            thread_name_prefix="asset-download",
+            initializer=adopt_job_context,
+            initargs=(job_context(),),
+        ) as executor:
             downloads = {}
             for idx, item in enumerate(plan):
                 query_hint = query_subset[idx % max(1, len(query_subset))]
@@ -177,6 +202,7 @@ def asset_finder(state: ShortState) -> ShortState:
                 downloads[executor.submit(_download_file, item["url"], dest)] = (item, dest)
 
             for future in as_completed(downloads):
+                checkpoint()
                 item, dest = downloads[future]
                 ok = future.result()
                 if ok:
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from ...config import SETTINGS
+from ..render import render_state_video
+from ..state import ShortState
+from ..utils import add_error, bump_attempt, ensure_runtime_dirs, record_render_stats, timestamp_name
+
+
+def final_render(state: ShortState) -> ShortState:
+    state = dict(state)
+    ensure_runtime_dirs(state)
+    attempt = bump_attempt(state, "final_render")
+    try:
+        profile = SETTINGS.final_profile
+        preview = state.get("preview_video", "")
+        if state.get("preview_profile") == profile.name and preview and Path(preview).exists():
+            # Drafts were disabled, so the reviewed cut already is the final encode.
+            state["final_video"] = preview
+        else:
+            output_dir = Path(state["output_dir"])
+            final_video_path = output_dir / timestamp_name("short_final", ".mp4")
+            record_render_stats(state, render_state_video(state, profile, final_video_path))
+            state["final_video"] = str(final_video_path)
+        state["status"] = "final_ready"
+        state["next_action"] = "finalize"
+        return state
+    except Exception as exc:  # noqa: BLE001
+        add_error(state, f"final_render error: {exc}")
+        state["status"] = "failed:final_render"
+        state["next_action"] = "render_final" if attempt < 3 else "failed"
+        return state
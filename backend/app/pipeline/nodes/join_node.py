@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from loguru import logger
+
+from ..state import ShortState
+from ..utils import add_error
+
+
+def media_join(state: ShortState) -> ShortState:
+    """Runs once asset search, narration and music have all finished; picks the next step."""
+    state = dict(state)
+    results = state.get("branch_results", {})
+    actions = {name: result.get("next_action", "") for name, result in results.items()}
+    logger.info("Media branches finished: {}", actions)
+
+    if "failed" in actions.values():
+        state["status"] = "failed:media"
+        state["next_action"] = "failed"
+    elif "needs_script_revision" in actions.values():
+        state["status"] = "media_needs_script_revision"
+        state["next_action"] = "needs_script_revision"
+    elif not (state.get("images") or state.get("clips")):
+        add_error(state, "media_join: no usable assets after asset search.")
+        state["status"] = "assets_insufficient_script_revision"
+        state["next_action"] = "needs_script_revision"
+    else:
+        state["status"] = "media_ready"
+        state["next_action"] = "assemble_video"
+    return state
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
-import random
 from pathlib import Path
 
+from loguru import logger
+
+from ..cache import cache_dir, input_fingerprint, is_unchanged, record_fingerprint
+from ..music_catalog import music_catalog
+from ..procedural_audio import cached_bed
 from ..state import ShortState
-from ..utils import add_error, bump_attempt, ensure_runtime_dirs, estimate_narration_seconds, make_tone_wav, timestamp_name
+from ..utils import add_error, bump_attempt, ensure_runtime_dirs, estimate_narration_seconds
 
 
 def music_selector(state: ShortState) -> ShortState:
@@ -13,24 +17,30 @@ def music_selector(state: ShortState) -> ShortState:
     bump_attempt(state, "music_selector")
 
     try:
-        music_dir = Path(state["assets_dir"]) / "music"
-        tracks = [
-            p
-            for p in music_dir.glob("*")
-            if p.suffix.lower() in {".mp3", ".wav", ".m4a", ".aac", ".ogg"}
-        ]
-        if tracks:
-            state["bg_music"] = str(random.choice(tracks))
+        catalog = music_catalog(Path(state["assets_dir"]) / "music", cache_dir(state, "music"))
+        # Narration runs in parallel, so size the bed from the script with some headroom.
+        required_s = min(59.0, estimate_narration_seconds(state.get("script", "")) * 1.2)
+        fingerprint = input_fingerprint(round(required_s, 1), catalog.version)
+        if is_unchanged(state, "music_selector", fingerprint, state.get("bg_music")):
+            logger.info("Music inputs unchanged; keeping {}", state["bg_music"])
+            state["status"] = "music_ready"
+            state["next_action"] = "assemble_video"
+            return state
+        track = catalog.select(required_s)
+        if track:
+            state["bg_music"] = track.path
+            state["bg_music_duration"] = track.duration_s or 0.0
+            logger.info("Selected music {} ({}s for {:.1f}s needed)", track.name, track.duration_s, required_s)
         else:
-            fallback = music_dir / timestamp_name("bg_music", ".wav")
-            make_tone_wav(
-                fallback,
-                duration_s=max(12.0, estimate_narration_seconds(state.get("script", ""))),
-                freq=112.0,
-                volume=0.05,
-            )
+            duration_s = max(12.0, required_s)
+            fallback = cached_bed(cache_dir(state, "tones"), duration_s=duration_s, freq=112.0, volume=0.05)
             state["bg_music"] = str(fallback)
-            add_error(state, "No local royalty-free music found. Generated fallback tone music.")
+            state["bg_music_duration"] = round(duration_s, 1)
+            if catalog.indexing:
+                add_error(state, "Music library is still being indexed. Generated fallback tone music.")
+            else:
+                add_error(state, "No local royalty-free music found. Generated fallback tone music.")
+        record_fingerprint(state, "music_selector", fingerprint)
         state["status"] = "music_ready"
         state["next_action"] = "assemble_video"
         return state
@@ -11,18 +11,21 @@ ALLOWED = {"approved", "needs_script_revision", "find_more_assets", "reassemble"
 def human_review(state: ShortState) -> ShortState:
     state = dict(state)
     ensure_runtime_dirs(state)
-    bump_attempt(state, "human_review")
+    attempt = bump_attempt(state, "human_review")
 
     decision = state.get("human_decision", "")
     notes = state.get("review_notes", "")
 
-    if decision not in ALLOWED:
+    # A decision already in state only answers the first review; later previews
+    # must be reviewed again instead of replaying the previous decision forever.
+    if decision not in ALLOWED or attempt > 1:
         payload = {
             "message": "Review required",
             "script": state.get("script", ""),
             "clips": state.get("clips", []),
             "images": state.get("images", []),
-            "final_video": state.get("final_video", ""),
+            "preview_video": state.get("preview_video", ""),
+            "preview_profile": state.get("preview_profile", ""),
             "options": sorted(ALLOWED),
         }
         feedback = interrupt(payload)
@@ -1,11 +1,23 @@
 from __future__ import annotations
 
+import re
+import time
+from typing import Callable
+
 from loguru import logger
 
 from ...config import SETTINGS
+from ...metrics import track_call
+from ..cache import cache_dir, record_lookup
+from ..control import checkpoint
+from ..llm import chat_model, load_cached_script, script_cache_key, store_cached_script
 from ..state import ShortState
+from ..tts import SentencePrefetcher
 from ..utils import add_error, bump_attempt, ensure_runtime_dirs, split_sentences
 
+# Same boundary rule as split_sentences, so streamed sentences match the final split.
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
 
 def _default_script(topic: str, notes: str = "") -> str:
     note_line = f" Keep this review note in mind: {notes}" if notes else ""
@@ -21,11 +33,47 @@ def _default_script(topic: str, notes: str = "") -> str:
     )
 
 
-def _generate_script(topic: str, notes: str = "") -> str:
+def _content_text(raw_content) -> str:
+    return raw_content if isinstance(raw_content, str) else str(raw_content)
+
+
+def _stream_sentences(llm, prompt: str, on_sentence: Callable[[str], None], stats: dict) -> str:
+    """Consume the token stream, handing each completed sentence to ``on_sentence``."""
+    started = time.monotonic()
+    text = ""
+    emitted = 0
+    for chunk in llm.stream(prompt):
+        checkpoint()
+        piece = _content_text(chunk.content)
+        if not piece:
+            continue
+        if "first_token_ms" not in stats:
+            stats["first_token_ms"] = round((time.monotonic() - started) * 1000, 1)
+        text += piece
+        parts = _SENTENCE_END.split(text.lstrip())
+        # The last part may still be growing; everything before it is final.
+        for sentence in parts[emitted : len(parts) - 1]:
+            if sentence.strip():
+                on_sentence(sentence.strip())
+        emitted = max(emitted, len(parts) - 1)
+    parts = _SENTENCE_END.split(text.strip())
+    for sentence in parts[emitted:]:
+        if sentence.strip():
+            on_sentence(sentence.strip())
+    stats["total_ms"] = round((time.monotonic() - started) * 1000, 1)
+    return text.strip()
+
+
+def _generate_script(
+    topic: str,
+    notes: str = "",
+    on_sentence: Callable[[str], None] | None = None,
+    stats: dict | None = None,
+) -> str:
     if not SETTINGS.openai_api_key:
         return _default_script(topic, notes)
     try:
-        from langchain_openai import ChatOpenAI
+        llm = chat_model()
     except Exception:
         return _default_script(topic, notes)
 
@@ -41,17 +89,11 @@ def _generate_script(topic: str, notes: str = "") -> str:
     if notes:
         prompt += f"Reviewer feedback to include: {notes}\n"
 
-    llm = ChatOpenAI(
-        api_key=SETTINGS.openai_api_key,
-        model=SETTINGS.openai_model,
-        temperature=0.7,
-    )
-    response = llm.invoke(prompt)
-    raw_content = response.content
-    if isinstance(raw_content, str):
-        text = raw_content.strip()
-    else:
-        text = str(raw_content).strip()
+    with track_call("llm"):
+        if on_sentence is not None:
+            text = _stream_sentences(llm, prompt, on_sentence, stats if stats is not None else {})
+        else:
+            text = _content_text(llm.invoke(prompt).content).strip()
     return text or _default_script(topic, notes)
 
 
@@ -67,9 +109,47 @@ def script_generator(state: ShortState) -> ShortState:
         state["status"] = "failed:missing_topic"
         return state
 
+    notes = state.get("review_notes", "")
+    llm_cache = cache_dir(state, "llm")
+    key = script_cache_key(topic, notes)
+    # Regenerate requests and revision loops must not be answered with the same cached script.
+    bypass = bool(state.get("regenerate_script")) or state.get("next_action") == "needs_script_revision"
+
     try:
-        logger.info("Generating script for topic='{}'", topic)
-        script = _generate_script(topic, state.get("review_notes", ""))
+        cached = None
+        if SETTINGS.openai_api_key:
+            if bypass:
+                record_lookup("llm_script", "bypass")
+            else:
+                cached = load_cached_script(llm_cache, key)
+        if cached:
+            logger.info("Script cache hit for topic='{}'", topic)
+            script = cached
+            state["script_cache"] = "hit"
+        elif SETTINGS.script_streaming and SETTINGS.openai_api_key:
+            logger.info("Generating script for topic='{}'", topic)
+            # Narration for each finished sentence starts while the LLM is still writing.
+            prefetcher = SentencePrefetcher(cache_dir(state, "tts"))
+            stream_stats: dict = {}
+            submitted = 0
+
+            def _on_sentence(sentence: str) -> None:
+                nonlocal submitted
+                if submitted < 10:
+                    prefetcher.submit(sentence)
+                    submitted += 1
+
+            try:
+                script = _generate_script(topic, notes, _on_sentence, stream_stats)
+            finally:
+                stream_stats.update(prefetcher.close(wait=False))
+            state["script_stream"] = stream_stats
+        else:
+            logger.info("Generating script for topic='{}'", topic)
+            script = _generate_script(topic, notes)
+        if not cached and SETTINGS.openai_api_key and script != _default_script(topic, notes):
+            store_cached_script(llm_cache, key, script, topic=topic, model=SETTINGS.openai_model)
+            state["script_cache"] = "bypass" if bypass else "miss"
         state["script"] = " ".join(split_sentences(script, max_sentences=10))
         state["status"] = "script_ready"
         state["next_action"] = "find_assets"
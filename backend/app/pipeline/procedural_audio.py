@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import math
+import os
+import sys
+import uuid
+import wave
+from array import array
+from pathlib import Path
+from typing import Sequence
+
+from .cache import cache_key, record_lookup
+
+try:  # numpy ships with moviepy; the array path keeps this module usable without it.
+    import numpy as np
+except Exception:  # noqa: BLE001
+    np = None
+
+SAMPLE_RATE = 44100
+# Bump when the synthesis changes so cached WAVs are regenerated.
+PROCEDURAL_AUDIO_VERSION = 1
+
+Partials = Sequence[tuple[float, float]]  # (frequency Hz, relative gain)
+
+
+def _samples_numpy(
+    n: int, sample_rate: int, partials: Partials, amplitude: float, tremolo_hz: float, fade_n: int
+) -> bytes:
+    t = np.arange(n, dtype=np.float64) / sample_rate
+    signal = np.zeros(n, dtype=np.float64)
+    for freq, gain in partials:
+        signal += gain * np.sin(2 * np.pi * freq * t)
+    if tremolo_hz:
+        signal *= 0.85 + 0.15 * np.cos(2 * np.pi * tremolo_hz * t)
+    if fade_n:
+        ramp = np.linspace(0.0, 1.0, fade_n)
+        signal[:fade_n] *= ramp
+        signal[-fade_n:] *= ramp[::-1]
+    return (signal * amplitude).astype("<i2").tobytes()
+
+
+def _samples_array(
+    n: int, sample_rate: int, partials: Partials, amplitude: float, tremolo_hz: float, fade_n: int
+) -> bytes:
+    steps = [(2 * math.pi * freq / sample_rate, gain) for freq, gain in partials]
+    tremolo_step = 2 * math.pi * tremolo_hz / sample_rate
+    out = array("h", bytes(2 * n))
+    for i in range(n):
+        value = sum(gain * math.sin(step * i) for step, gain in steps)
+        if tremolo_hz:
+            value *= 0.85 + 0.15 * math.cos(tremolo_step * i)
+        if fade_n:
+            value *= min(1.0, i / fade_n, (n - 1 - i) / fade_n)
+        out[i] = int(value * amplitude)
+    if sys.byteorder == "big":
+        out.byteswap()
+    return out.tobytes()
+
+
+def write_wav(
+    path: Path,
+    duration_s: float,
+    partials: Partials,
+    volume: float = 0.1,
+    tremolo_hz: float = 0.0,
+    fade_s: float = 0.0,
+    sample_rate: int = SAMPLE_RATE,
+) -> Path:
+    """Synthesize a mono 16-bit WAV in one buffer and write it with a single call."""
+    n = int(sample_rate * max(0.1, duration_s))
+    total_gain = sum(abs(gain) for _, gain in partials) or 1.0
+    amplitude = 32767 * max(0.0, min(volume, 1.0)) / total_gain
+    fade_n = min(n // 2, int(sample_rate * fade_s))
+    render = _samples_numpy if np is not None else _samples_array
+    frames = render(n, sample_rate, partials, amplitude, tremolo_hz, fade_n)
+    with wave.open(str(path), "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(frames)
+    return path
+
+
+def _cached(cache_root: Path, kind: str, duration_s: float, freq: float, volume: float, **params) -> Path:
+    duration_s = round(max(0.1, duration_s), 1)
+    key = cache_key(kind, PROCEDURAL_AUDIO_VERSION, duration_s, round(freq, 2), round(volume, 3))
+    path = cache_root / f"{kind}_{key}.wav"
+    record_lookup("procedural_audio", "hit" if path.exists() else "miss")
+    if not path.exists():
+        # Concurrent writers (threads or render workers) each use their own temp file; the rename is atomic.
+        tmp = path.with_name(f"{path.stem}.{uuid.uuid4().hex[:8]}.tmp.wav")
+        write_wav(tmp, duration_s, volume=volume, **params)
+        os.replace(tmp, path)
+    return path
+
+
+def cached_tone(cache_root: Path, duration_s: float, freq: float = 220.0, volume: float = 0.1) -> Path:
+    """Single sine tone, shared by every job asking for the same (duration, freq, volume)."""
+    return _cached(cache_root, "tone", duration_s, freq, volume, partials=[(freq, 1.0)])
+
+
+def cached_bed(cache_root: Path, duration_s: float, freq: float = 110.0, volume: float = 0.05) -> Path:
+    """Soft root/fifth/octave pad with a slow swell and fades, used as fallback background music."""
+    return _cached(
+        cache_root,
+        "bed",
+        duration_s,
+        freq,
+        volume,
+        partials=[(freq, 1.0), (freq * 1.5, 0.5), (freq * 2.0, 0.3), (freq * 3.0, 0.1)],
+        tremolo_hz=0.2,
+        fade_s=1.5,
+    )
@@ -0,0 +1,25 @@
+from .budget import RENDER_BUDGET, MemoryBudget, RssSampler, estimate_render_mb
+from .engines import ENGINES, RENDER_MODES, render_timeline
+from .job import render_state_video
+from .progress import RenderProgress, render_progress
+from .resources import ClipScope, resource_snapshot
+from .timeline import Caption, Segment, Timeline, build_timeline
+
+__all__ = [
+    "Caption",
+    "ClipScope",
+    "ENGINES",
+    "MemoryBudget",
+    "RENDER_BUDGET",
+    "RENDER_MODES",
+    "RenderProgress",
+    "RssSampler",
+    "Segment",
+    "Timeline",
+    "build_timeline",
+    "estimate_render_mb",
+    "render_progress",
+    "render_state_video",
+    "render_timeline",
+    "resource_snapshot",
+]
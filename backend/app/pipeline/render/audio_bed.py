@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import uuid
+from pathlib import Path
+
+from ...config import SETTINGS
+from ..cache import cache_key, file_digest, record_lookup
+from .ffmpeg_engine import build_audio_mix, run_ffmpeg
+from .timeline import Timeline
+
+# Bump when the mix or loudness chain changes so cached beds are rebuilt.
+AUDIO_BED_VERSION = 2
+
+
+def build_audio_bed(timeline: Timeline, beds_dir: Path) -> Path | None:
+    """Pre-mix narration and the attenuated, looped music into one normalized track.
+
+    Cached by input content, duration, music gain and loudness target, so
+    reassembles and final renders only mux a ready-made AAC stream.
+    """
+    if not timeline.narration and not timeline.music:
+        return None
+    loudness = [SETTINGS.audio_loudness_lufs, -1.5, 11]
+    key = cache_key(
+        "audio-bed",
+        AUDIO_BED_VERSION,
+        file_digest(timeline.narration) if timeline.narration else None,
+        file_digest(timeline.music) if timeline.music else None,
+        round(timeline.duration, 3),
+        timeline.music_volume,
+        loudness,
+    )
+    out = beds_dir / f"{key}.m4a"
+    if out.exists():
+        record_lookup("audio_bed", "hit")
+        return out
+    record_lookup("audio_bed", "miss")
+
+    inputs, filters, label = build_audio_mix(timeline, first_input=0)
+    integrated, true_peak, lra = loudness
+    filters.append(f"{label}loudnorm=I={integrated}:TP={true_peak}:LRA={lra},aresample=48000[bed]")
+    tmp = out.with_name(f"{key}.{uuid.uuid4().hex[:8]}.tmp.m4a")
+    run_ffmpeg(
+        [
+            "ffmpeg",
+            "-y",
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            *inputs,
+            "-filter_complex",
+            ";".join(filters),
+            "-map",
+            "[bed]",
+            "-c:a",
+            "aac",
+            "-b:a",
+            "192k",
+            "-t",
+            f"{timeline.duration:.3f}",
+            str(tmp),
+        ]
+    )
+    tmp.replace(out)
+    return out
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+from ...config import SETTINGS
+from ..control import WATCHDOG_INTERVAL_S, checkpoint
+from .timeline import Timeline
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+_MB = 1024 * 1024
+
+# Rough per-process costs used to estimate a render's footprint.
+PROCESS_BASE_MB = 150
+DECODER_MB = 60
+
+
+def estimate_render_mb(timeline: Timeline, engine: str, mode: str, workers: int) -> int:
+    """Heuristic peak footprint of one render, used only for admission to the budget."""
+    frame_mb = timeline.width * timeline.height * 3 / _MB
+    videos = sum(1 for s in timeline.segments if s.kind == "video")
+    if mode == "segmented":
+        # One window per worker: a single decoder plus its caption layers.
+        per_worker = PROCESS_BASE_MB + DECODER_MB + frame_mb * 8
+        return int(per_worker * max(1, min(workers, max(1, len(timeline.segments)))))
+    if engine == "ffmpeg":
+        return int(PROCESS_BASE_MB + (len(timeline.segments) + len(timeline.captions)) * frame_mb * 2)
+    # moviepy keeps every reader open and composites full frames for all layers.
+    layers = len(timeline.segments) + len(timeline.captions) + 4
+    return int(PROCESS_BASE_MB + videos * DECODER_MB + layers * frame_mb)
+
+
+class MemoryBudget:
+    """Counting gate over estimated render memory.
+
+    ``reserve`` blocks until the estimate fits under the budget. A render that
+    alone exceeds the budget is still admitted once nothing else is running,
+    so oversized jobs are serialized instead of deadlocking. The wait wakes
+    up periodically so a cancel or deadline still stops a job queued here.
+    """
+
+    def __init__(self, budget_mb: int) -> None:
+        self.budget_mb = budget_mb
+        self._used_mb = 0
+        self._cond = threading.Condition()
+
+    @contextmanager
+    def reserve(self, estimate_mb: int) -> Iterator[float]:
+        started = time.monotonic()
+        with self._cond:
+            if self.budget_mb > 0:
+                while self._used_mb and self._used_mb + estimate_mb > self.budget_mb:
+                    checkpoint()
+                    self._cond.wait(timeout=WATCHDOG_INTERVAL_S)
+            self._used_mb += estimate_mb
+        try:
+            yield time.monotonic() - started
+        finally:
+            with self._cond:
+                self._used_mb -= estimate_mb
+                self._cond.notify_all()
+
+    def snapshot(self) -> dict[str, int]:
+        with self._cond:
+            return {"budget_mb": self.budget_mb, "reserved_mb": self._used_mb}
+
+
+RENDER_BUDGET = MemoryBudget(SETTINGS.render_memory_budget_mb)
+
+
+def _process_tree_rss_bytes(root_pids: Iterable[int]) -> int | None:
+    """Summed RSS of ``root_pids`` and all their descendants, ``None`` without /proc."""
+    proc = Path("/proc")
+    if not proc.exists():
+        return None
+    roots = set(root_pids)
+    parents: dict[int, int] = {}
+    rss: dict[int, int] = {}
+    for entry in proc.iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_text()
+            # Fields after the parenthesised command name; ppid is the 2nd, rss (pages) the 22nd.
+            fields = stat[stat.rindex(")") + 2 :].split()
+            pid = int(entry.name)
+            parents[pid] = int(fields[1])
+            rss[pid] = int(fields[21]) * _PAGE_SIZE
+        except (OSError, ValueError, IndexError):
+            continue
+    total = 0
+    for pid in rss:
+        cursor = pid
+        while cursor and cursor not in roots:
+            cursor = parents.get(cursor, 0)
+        if cursor in roots:
+            total += rss[pid]
+    return total
+
+
+def _process_rss_bytes(pid: int) -> int | None:
+    """RSS of ``pid`` alone, ``None`` without /proc."""
+    try:
+        return int(Path(f"/proc/{pid}/statm").read_text().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class RssSampler:
+    """Samples the peak memory of one render.
+
+    With ``pids`` (a callable returning the live processes the render runs
+    in, i.e. its ffmpeg processes and segment pool workers) a sample is the
+    RSS of those processes and their children plus the server process's
+    growth over its RSS when sampling started, which is where moviepy
+    composites frames. Growth of the server caused by concurrent jobs is
+    included in the latter. Without ``pids`` the whole server process tree
+    is sampled.
+    """
+
+    def __init__(self, pids: Callable[[], Iterable[int]] | None = None, interval_s: float = 0.25) -> None:
+        self.pids = pids
+        self.interval_s = interval_s
+        self.peak_bytes: int | None = None
+        self._baseline_bytes: int | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def peak_mb(self) -> float | None:
+        return round(self.peak_bytes / _MB, 1) if self.peak_bytes is not None else None
+
+    def _sample(self) -> None:
+        if self.pids is not None:
+            own = _process_rss_bytes(os.getpid())
+            if self._baseline_bytes is None:
+                self._baseline_bytes = own
+            children = _process_tree_rss_bytes(self.pids())
+            current = None
+            if own is not None and children is not None:
+                current = max(0, own - (self._baseline_bytes or 0)) + children
+        else:
+            current = _process_tree_rss_bytes([os.getpid()])
+            if current is None and resource is not None:
+                # No /proc: fall back to the process high-water mark (bytes on macOS, KiB elsewhere).
+                maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+                current = maxrss if sys.platform == "darwin" else maxrss * 1024
+        if current is not None:
+            self.peak_bytes = max(self.peak_bytes or 0, current)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            self._sample()
+
+    def __enter__(self) -> "RssSampler":
+        self._sample()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="rss-sampler")
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._sample()
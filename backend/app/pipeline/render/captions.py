@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import uuid
+from functools import lru_cache
+from pathlib import Path
+
+from PIL import Image, ImageDraw, ImageFont
+
+from ...config import SETTINGS
+from ..cache import cache_key
+
+# Bump when the rasterization itself changes so cached PNGs are regenerated.
+CAPTION_FORMAT_VERSION = 1
+FONT_CANDIDATES = ("DejaVuSans-Bold.ttf", "DejaVuSans.ttf", "Arial.ttf")
+LINE_SPACING = 8
+
+
+@lru_cache(maxsize=32)
+def _load_font(path: str, size: int):
+    candidates = (path,) if path else FONT_CANDIDATES
+    for candidate in candidates:
+        try:
+            return ImageFont.truetype(candidate, size)
+        except Exception:  # noqa: BLE001
+            continue
+    return ImageFont.load_default(size)
+
+
+def _wrap_to_width(text: str, font, width: int) -> list[str]:
+    lines: list[str] = []
+    line = ""
+    for word in text.split():
+        candidate = f"{line} {word}".strip()
+        if not line or font.getlength(candidate) <= width:
+            line = candidate
+        else:
+            lines.append(line)
+            line = word
+    if line:
+        lines.append(line)
+    return lines
+
+
+def rasterize_caption(text: str, fontsize: int, width: int, color: str, captions_dir: Path) -> Path:
+    """Render one caption to a transparent PNG, cached by text, font, size and width."""
+    font_path = SETTINGS.caption_font
+    key = cache_key("caption", CAPTION_FORMAT_VERSION, text, font_path, fontsize, width, color)
+    out = captions_dir / f"{key}.png"
+    if out.exists():
+        return out
+
+    font = _load_font(font_path, fontsize)
+    lines = _wrap_to_width(text, font, width) or [""]
+    ascent, descent = font.getmetrics()
+    line_height = ascent + descent
+    height = line_height * len(lines) + LINE_SPACING * (len(lines) - 1)
+    image = Image.new("RGBA", (width, max(1, height)), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(image)
+    for idx, line in enumerate(lines):
+        x = (width - font.getlength(line)) / 2
+        draw.text((x, idx * (line_height + LINE_SPACING)), line, font=font, fill=color)
+
+    # Unique per writer: concurrent jobs often rasterize identical captions into the shared cache.
+    tmp = out.with_name(f"{key}.{uuid.uuid4().hex[:8]}.tmp{out.suffix}")
+    image.save(tmp)
+    tmp.replace(out)
+    return out
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from pathlib import Path
+from .ffmpeg_engine import render_with_ffmpeg
+from .moviepy_engine import render_with_moviepy
+from .progress import RenderProgress
+from .segmented import Renderer, render_segmented
+from .timeline import Timeline
+
+ENGINES: dict[str, Renderer] = {
+    "moviepy": render_with_moviepy,
+    "ffmpeg": render_with_ffmpeg,
+}
+RENDER_MODES = ("single", "segmented")
+
+
+def render_timeline(
+    timeline: Timeline,
+    output_path: Path,
+    engine: str = "moviepy",
+    mode: str = "single",
+    segments_dir: Path | None = None,
+    workers: int = 1,
+    progress: RenderProgress | None = None,
+) -> None:
+    try:
+        renderer = ENGINES[engine]
+    except KeyError as exc:
+        raise ValueError(f"unknown render engine: {engine!r} (expected one of {sorted(ENGINES)})") from exc
+    if mode == "single":
+        if progress:
+            progress.set_phase("encoding")
+        renderer(timeline, output_path, progress.callback() if progress else None)
+    elif mode == "segmented":
+        if segments_dir is None:
+            raise ValueError("segmented render mode requires segments_dir")
+        render_segmented(timeline, output_path, engine, renderer, segments_dir, workers=workers, progress=progress)
+    else:
+        raise ValueError(f"unknown render mode: {mode!r} (expected one of {list(RENDER_MODES)})")
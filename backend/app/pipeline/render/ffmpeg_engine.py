@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import subprocess
+import tempfile
+from pathlib import Path
+
+from loguru import logger
+
+from ..control import checkpoint, tracked_process
+from .progress import FrameCallback
+from .timeline import Timeline
+
+
+def _hex_color(rgb: tuple[int, int, int]) -> str:
+    return "0x{:02x}{:02x}{:02x}".format(*rgb)
+
+
+def build_ffmpeg_command(timeline: Timeline, output_path: Path) -> list[str]:
+    """Translate a timeline into a single ffmpeg filter_complex invocation.
+
+    Mirrors the moviepy engine: cover-crop every segment, hold the last frame
+    to fill the target duration, overlay the cached caption PNGs, and mix
+    narration with the looped music bed without amix normalization
+    (CompositeAudioClip sums).
+    """
+    w, h, fps, total = timeline.width, timeline.height, timeline.fps, timeline.duration
+    inputs: list[str] = []
+    filters: list[str] = []
+    labels: list[str] = []
+
+    for idx, segment in enumerate(timeline.segments):
+        if segment.kind == "image":
+            inputs += ["-loop", "1", "-framerate", str(fps), "-t", f"{segment.duration:.3f}", "-i", segment.path]
+        else:
+            inputs += ["-i", segment.path]
+        filters.append(
+            f"[{idx}:v]scale={w}:{h}:force_original_aspect_ratio=increase,crop={w}:{h},setsar=1,"
+            f"fps={fps},tpad=stop_mode=clone:stop_duration={segment.duration:.3f},"
+            f"trim=duration={segment.duration:.3f},setpts=PTS-STARTPTS,format=yuv420p[v{idx}]"
+        )
+        labels.append(f"[v{idx}]")
+
+    if labels:
+        filters.append(f"{''.join(labels)}concat=n={len(labels)}:v=1:a=0[vcat]")
+    else:
+        color_idx = _count_inputs(inputs)
+        inputs += [
+            "-f",
+            "lavfi",
+            "-i",
+            f"color=c={_hex_color(timeline.background)}:s={w}x{h}:r={fps}:d={total:.3f}",
+        ]
+        filters.append(f"[{color_idx}:v]format=yuv420p[vcat]")
+
+    filters.append(
+        f"[vcat]tpad=stop_mode=clone:stop_duration={total:.3f},trim=duration={total:.3f},setpts=PTS-STARTPTS[vbase]"
+    )
+    current = "[vbase]"
+    for idx, caption in enumerate(c for c in timeline.captions if c.image):
+        caption_input = _count_inputs(inputs)
+        inputs += ["-i", caption.image]
+        end = caption.start + caption.duration
+        filters.append(
+            f"{current}[{caption_input}:v]overlay=x=(W-w)/2:y={caption.y}:"
+            f"enable='between(t,{caption.start:.3f},{end:.3f})'[vcap{idx}]"
+        )
+        current = f"[vcap{idx}]"
+    filters.append(f"{current}format=yuv420p[vout]")
+
+    audio_inputs, audio_filters, audio_out = build_audio_mix(timeline, _count_inputs(inputs))
+    inputs += audio_inputs
+    filters += audio_filters
+
+    command = ["ffmpeg", "-y", "-hide_banner", "-loglevel", "error", *inputs]
+    command += ["-filter_complex", ";".join(filters), "-map", "[vout]"]
+    if audio_out:
+        command += ["-map", audio_out, *audio_codec_args(timeline)]
+    command += [
+        "-c:v",
+        "libx264",
+        "-preset",
+        timeline.profile.preset,
+        "-crf",
+        str(timeline.profile.crf),
+        "-pix_fmt",
+        "yuv420p",
+        "-r",
+        str(fps),
+        "-threads",
+        str(timeline.profile.threads),
+        "-t",
+        f"{total:.3f}",
+        "-movflags",
+        "+faststart",
+        str(output_path),
+    ]
+    return command
+
+
+# moviepy decodes every audio source to 44.1kHz stereo (``ffmpeg -ac 2``); match it so both engines sound alike.
+MIX_FORMAT = "aformat=sample_rates=44100:channel_layouts=stereo"
+
+
+def build_audio_mix(timeline: Timeline, first_input: int) -> tuple[list[str], list[str], str | None]:
+    """Inputs and filters for narration plus the looped, attenuated music bed.
+
+    When the timeline carries a pre-mixed audio bed it is mapped as-is.
+    """
+    if timeline.audio_bed:
+        return ["-i", timeline.audio_bed], [], f"{first_input}:a"
+    total = timeline.duration
+    inputs: list[str] = []
+    filters: list[str] = []
+    labels: list[str] = []
+    index = first_input
+    if timeline.narration:
+        inputs += ["-i", timeline.narration]
+        filters.append(f"[{index}:a]{MIX_FORMAT},apad,atrim=0:{total:.3f},asetpts=N/SR/TB[narr]")
+        labels.append("[narr]")
+        index += 1
+    if timeline.music:
+        inputs += (["-stream_loop", "-1"] if timeline.music_loops else []) + ["-i", timeline.music]
+        filters.append(
+            f"[{index}:a]{MIX_FORMAT},volume={timeline.music_volume},atrim=0:{total:.3f},asetpts=N/SR/TB[bg]"
+        )
+        labels.append("[bg]")
+        index += 1
+    if len(labels) > 1:
+        filters.append(f"{''.join(labels)}amix=inputs={len(labels)}:duration=longest:normalize=0[aout]")
+        return inputs, filters, "[aout]"
+    return inputs, filters, labels[0] if labels else None
+
+
+def audio_codec_args(timeline: Timeline) -> list[str]:
+    if timeline.audio_bed:
+        return ["-c:a", "copy"]
+    return ["-c:a", "aac", "-b:a", "192k"]
+
+
+def _count_inputs(args: list[str]) -> int:
+    return sum(1 for arg in args if arg == "-i")
+
+
+def run_ffmpeg(command: list[str], on_frames: FrameCallback | None = None) -> None:
+    """Run ffmpeg, raising with the tail of stderr on failure.
+
+    With ``on_frames``, ffmpeg writes ``-progress`` key=value blocks to stdout
+    and every ``frame=`` line is forwarded as it arrives.
+    """
+    if on_frames is not None:
+        command = [command[0], "-progress", "pipe:1", "-nostats", *command[1:]]
+    logger.debug("ffmpeg: {}", " ".join(command))
+    # stderr goes to a file so a chatty ffmpeg can never block on a full pipe while stdout is read.
+    with tempfile.TemporaryFile(mode="w+", encoding="utf-8", errors="replace") as stderr:
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=stderr, text=True)
+        with tracked_process(process):
+            assert process.stdout is not None
+            for line in process.stdout:
+                if on_frames is not None and line.startswith("frame="):
+                    value = line[6:].strip()
+                    if value.isdigit():
+                        on_frames(int(value))
+            returncode = process.wait()
+        if returncode != 0:
+            # Killed by the watchdog or a cancel request: report that, not ffmpeg's exit status.
+            checkpoint()
+            stderr.seek(0)
+            raise RuntimeError(f"ffmpeg failed ({returncode}): {stderr.read().strip()[-2000:]}")
+
+
+def render_with_ffmpeg(timeline: Timeline, output_path: Path, on_frames: FrameCallback | None = None) -> None:
+    run_ffmpeg(build_ffmpeg_command(timeline, output_path), on_frames)
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from ...config import SETTINGS, RenderProfile
+from ...metrics import RENDER_ENCODE_FPS, track_call
+from ..cache import cache_dir
+from ..control import scope_pids
+from ..state import ShortState
+from .audio_bed import build_audio_bed
+from .budget import RENDER_BUDGET, RssSampler, estimate_render_mb
+from .engines import render_timeline
+from .progress import track_render
+from .segmented import pool_pids
+from .timeline import build_timeline
+
+
+def render_state_video(state: ShortState, profile: RenderProfile, output_path: Path) -> dict[str, Any]:
+    """Render the job's timeline for ``profile`` inside the shared memory budget.
+
+    Returns render stats (timings, memory estimate, sampled peak RSS) for job state.
+    """
+    timeline = build_timeline(state, profile)
+    try:
+        audio_bed = build_audio_bed(timeline, cache_dir(state, "audio_beds"))
+        timeline.audio_bed = str(audio_bed) if audio_bed else None
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Audio pre-mix failed, mixing during encode instead: {}", exc)
+    engine, mode, workers = SETTINGS.render_engine, SETTINGS.render_mode, SETTINGS.render_workers
+    if SETTINGS.render_low_memory:
+        # Decode and encode one window at a time instead of compositing the whole timeline.
+        mode, workers = "segmented", 1
+    estimate_mb = estimate_render_mb(timeline, engine, mode, workers)
+    logger.info(
+        "Rendering {} segments ({:.1f}s, profile={} {}x{}) with engine={} mode={} workers={} est={}MB",
+        len(timeline.segments),
+        timeline.duration,
+        profile.name,
+        profile.width,
+        profile.height,
+        engine,
+        mode,
+        workers,
+        estimate_mb,
+    )
+    job_id = str(state.get("job_id", "na"))
+    scoped = scope_pids()
+
+    def render_pids() -> list[int]:
+        pids = scoped() if scoped is not None else []
+        if mode == "segmented" and workers > 1:
+            pids += pool_pids()
+        return pids
+
+    # Inside a job: this render's processes plus the server's growth; in scripts the whole process tree.
+    pids = render_pids if scoped is not None else None
+    with track_render(job_id, timeline, SETTINGS.render_progress_interval_s) as progress:
+        progress.set_phase("waiting_for_budget")
+        with RENDER_BUDGET.reserve(estimate_mb) as waited_s:
+            progress.set_phase("preparing")
+            started = time.monotonic()
+            with RssSampler(pids) as rss, track_call(f"encode_{profile.name}"):
+                render_timeline(
+                    timeline,
+                    output_path,
+                    engine=engine,
+                    mode=mode,
+                    segments_dir=cache_dir(state, "segments"),
+                    workers=workers,
+                    progress=progress,
+                )
+            elapsed_s = time.monotonic() - started
+    encode = progress.summary()
+    if encode["encode_fps"]:
+        RENDER_ENCODE_FPS.observe(encode["encode_fps"], profile=profile.name, engine=engine)
+        logger.info(
+            "Encoded {} frames for {} in {}s ({} fps)", encode["frames"], job_id, encode["encode_s"], encode["encode_fps"]
+        )
+    return {
+        "profile": profile.name,
+        "engine": engine,
+        "mode": mode,
+        "workers": workers,
+        "duration_s": round(timeline.duration, 3),
+        "audio_bed": timeline.audio_bed,
+        "render_s": round(elapsed_s, 3),
+        "budget_wait_s": round(waited_s, 3),
+        "estimated_mb": estimate_mb,
+        "budget_mb": RENDER_BUDGET.budget_mb,
+        "peak_rss_mb": rss.peak_mb,
+        "rss_scope": "render" if pids else "process_tree",
+        **encode,
+    }
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from loguru import logger
+
+from ..control import checkpoint
+from .progress import FrameCallback
+from .resources import ClipScope
+from .timeline import Timeline
+
+
+def _resize(clip, width: int, height: int):
+    """Lanczos resize through Pillow; moviepy 1.0.3's own resize needs ``Image.ANTIALIAS`` (gone in Pillow 10)."""
+    import numpy as np
+    from PIL import Image
+
+    return clip.fl_image(lambda frame: np.asarray(Image.fromarray(frame).resize((width, height), Image.Resampling.LANCZOS)))
+
+
+def _fit_vertical(clip, target_w: int, target_h: int):
+    clip_ratio = clip.w / clip.h
+    target_ratio = target_w / target_h
+    if clip_ratio > target_ratio:
+        resized = _resize(clip, max(target_w, round(clip.w * target_h / clip.h)), target_h)
+    else:
+        resized = _resize(clip, target_w, max(target_h, round(clip.h * target_w / clip.w)))
+    from moviepy.video.fx.all import crop
+
+    return crop(
+        resized,
+        x_center=resized.w / 2,
+        y_center=resized.h / 2,
+        width=target_w,
+        height=target_h,
+    )
+
+
+def _build_caption_layers(timeline: Timeline):
+    from moviepy.editor import ImageClip
+
+    layers = []
+    for caption in timeline.captions:
+        if not caption.image:
+            continue
+        clip = (
+            ImageClip(caption.image, transparent=True)
+            .set_position(("center", caption.y))
+            .set_start(caption.start)
+            .set_duration(caption.duration)
+        )
+        layers.append(clip)
+    return layers
+
+
+def _frame_logger(on_frames: FrameCallback | None):
+    """proglog logger forwarding moviepy's per-frame ``t`` bar to ``on_frames``.
+
+    It also checks for cancellation once per frame; raising here unwinds
+    moviepy's writer, which closes its ffmpeg pipe.
+    """
+    from proglog import ProgressBarLogger
+
+    class FrameLogger(ProgressBarLogger):
+        def bars_callback(self, bar, attr, value, old_value=None):
+            if bar == "t" and attr == "index":
+                checkpoint()
+                if on_frames is not None:
+                    on_frames(value + 1)
+
+    return FrameLogger()
+
+
+def render_with_moviepy(timeline: Timeline, output_path: Path, on_frames: FrameCallback | None = None) -> None:
+    from moviepy.audio.fx.all import audio_loop
+    from moviepy.editor import (
+        AudioFileClip,
+        ColorClip,
+        CompositeAudioClip,
+        CompositeVideoClip,
+        ImageClip,
+        VideoFileClip,
+        concatenate_videoclips,
+    )
+
+    size = (timeline.width, timeline.height)
+    with ClipScope(f"moviepy:{output_path.name}") as scope:
+        visual_clips = []
+        for segment in timeline.segments:
+            if segment.kind == "video":
+                clip = scope.own(VideoFileClip(segment.path, audio=False))
+                clip = _fit_vertical(clip, *size)
+                clip = clip.subclip(0, min(clip.duration, segment.duration)).set_duration(segment.duration)
+            else:
+                clip = scope.own(ImageClip(segment.path)).set_duration(segment.duration)
+            visual_clips.append(clip)
+
+        if not visual_clips:
+            visual_clips = [scope.own(ColorClip(size=size, color=timeline.background, duration=timeline.duration))]
+
+        base = concatenate_videoclips(visual_clips, method="compose")
+        if base.duration > timeline.duration:
+            base = base.subclip(0, timeline.duration)
+        else:
+            base = base.set_duration(timeline.duration)
+
+        layers = [base]
+        try:
+            layers.extend(scope.own(layer) for layer in _build_caption_layers(timeline))
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Caption layer skipped due to error: {}", exc)
+
+        composed = scope.own(CompositeVideoClip(layers, size=size)).set_duration(timeline.duration)
+        # A pre-mixed bed is handed to the writer as a file and stream-copied;
+        # mixing per chunk is only the fallback when no bed was built.
+        if not timeline.audio_bed:
+            audio_tracks = []
+            if timeline.narration:
+                audio_tracks.append(scope.own(AudioFileClip(timeline.narration)).volumex(1.0))
+            if timeline.music:
+                bg_track = scope.own(AudioFileClip(timeline.music))
+                if timeline.music_loops:
+                    bg_track = audio_loop(bg_track, duration=timeline.duration)
+                else:
+                    bg_track = bg_track.subclip(0, timeline.duration)
+                audio_tracks.append(bg_track.volumex(timeline.music_volume))
+            if audio_tracks:
+                composed = composed.set_audio(CompositeAudioClip(audio_tracks).set_duration(timeline.duration))
+
+        try:
+            composed.write_videofile(
+                str(output_path),
+                fps=timeline.fps,
+                audio=timeline.audio_bed or True,
+                codec="libx264",
+                audio_codec="aac",
+                preset=timeline.profile.preset,
+                threads=timeline.profile.threads,
+                ffmpeg_params=["-crf", str(timeline.profile.crf)],
+                logger=_frame_logger(on_frames),
+            )
+        except Exception:
+            # A writer killed by the watchdog surfaces as a broken pipe; report the cancel instead.
+            checkpoint()
+            raise
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from loguru import logger
+
+from ..control import run_tracked
+
+
+def probe_duration(path: str | Path) -> float | None:
+    try:
+        completed = run_tracked(
+            [
+                "ffprobe",
+                "-v",
+                "error",
+                "-show_entries",
+                "format=duration",
+                "-of",
+                "default=noprint_wrappers=1:nokey=1",
+                str(path),
+            ],
+            timeout=30,
+        )
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("ffprobe failed for {}: {}", path, exc)
+        return None
+    if completed.returncode != 0:
+        logger.warning("ffprobe failed for {}: {}", path, completed.stderr.strip())
+        return None
+    try:
+        return float(completed.stdout.strip())
+    except ValueError:
+        return None
+
+
+def probe_audio(path: str | Path) -> dict[str, float | int | None]:
+    """Duration and sample rate of the first audio stream, ``None`` where ffprobe can't tell."""
+    info: dict[str, float | int | None] = {"duration_s": None, "sample_rate": None}
+    try:
+        completed = run_tracked(
+            [
+                "ffprobe",
+                "-v",
+                "error",
+                "-select_streams",
+                "a:0",
+                "-show_entries",
+                "format=duration:stream=sample_rate",
+                "-of",
+                "json",
+                str(path),
+            ],
+            timeout=30,
+        )
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("ffprobe failed for {}: {}", path, exc)
+        return info
+    if completed.returncode != 0:
+        logger.warning("ffprobe failed for {}: {}", path, completed.stderr.strip())
+        return info
+    try:
+        payload = json.loads(completed.stdout or "{}")
+        streams = payload.get("streams") or [{}]
+        if payload.get("format", {}).get("duration"):
+            info["duration_s"] = float(payload["format"]["duration"])
+        if streams[0].get("sample_rate"):
+            info["sample_rate"] = int(streams[0]["sample_rate"])
+    except (ValueError, TypeError):
+        pass
+    return info
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_right
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
+
+from loguru import logger
+
+from .timeline import Timeline
+
+# Receives the number of frames encoded so far by one encoder invocation.
+FrameCallback = Callable[[int], None]
+
+LOG_INTERVAL_S = 10.0
+
+_ACTIVE_LOCK = threading.Lock()
+_ACTIVE: dict[str, "RenderProgress"] = {}
+
+
+class RenderProgress:
+    """Frames, encode fps, ETA and active segment of one render, published at a bounded rate.
+
+    Encoders call ``update`` on every frame; a snapshot is only rebuilt every
+    ``interval_s`` and a log line written every ``LOG_INTERVAL_S``, so the
+    cost stays flat however fast the encoder reports.
+    """
+
+    def __init__(self, job_id: str, timeline: Timeline, interval_s: float = 1.0) -> None:
+        self.job_id = job_id
+        self.profile = timeline.profile.name
+        self.fps = timeline.fps
+        self.total_frames = max(1, round(timeline.duration * timeline.fps))
+        self.segments_total = len(timeline.segments)
+        # Frame index at which each segment starts, for mapping progress to a segment.
+        self._segment_starts = [round(s.start * timeline.fps) for s in timeline.segments]
+        self.interval_s = interval_s
+        self.phase = "preparing"
+        self.frames_done = 0
+        self.segment: int | None = None
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        # Set when encoding starts, not at the first callback: pool windows only report when they finish.
+        self._encode_started: float | None = None
+        self._last_frame_at: float | None = None
+        self._published_at = 0.0
+        self._published_frames = 0
+        self._logged_at = self._started
+        self._rate = 0.0
+        self._snapshot: dict[str, Any] = {}
+        self._publish(time.monotonic())
+
+    def set_total(self, frames: int) -> None:
+        """Only ``frames`` still need encoding (segmented mode reuses cached windows)."""
+        with self._lock:
+            self.total_frames = max(1, frames)
+
+    def set_phase(self, phase: str) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self.phase = phase
+            if phase == "encoding" and self._encode_started is None:
+                self._encode_started = now
+            self._publish(now)
+
+    def update(self, frames_done: int, segment: int | None = None) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if self._encode_started is None:
+                self._encode_started = now
+                self.phase = "encoding"
+            self._last_frame_at = now
+            self.frames_done = min(frames_done, self.total_frames)
+            if segment is None and self._segment_starts:
+                segment = bisect_right(self._segment_starts, frames_done)
+            self.segment = segment
+            if now - self._published_at >= self.interval_s:
+                self._publish(now)
+
+    def callback(self, base_frames: int = 0, segment: int | None = None) -> FrameCallback:
+        return lambda frames: self.update(base_frames + frames, segment)
+
+    def _publish(self, now: float) -> None:
+        elapsed = now - self._published_at
+        if self._published_at and elapsed > 0:
+            self._rate = (self.frames_done - self._published_frames) / elapsed
+        self._published_at = now
+        self._published_frames = self.frames_done
+        remaining = self.total_frames - self.frames_done
+        self._snapshot = {
+            "profile": self.profile,
+            "phase": self.phase,
+            "frames_done": self.frames_done,
+            "frames_total": self.total_frames,
+            "percent": round(100 * self.frames_done / self.total_frames, 1),
+            "encode_fps": round(self._rate, 2),
+            "eta_s": round(remaining / self._rate, 1) if self._rate > 0 else None,
+            "segment": self.segment,
+            "segments_total": self.segments_total,
+            "elapsed_s": round(now - self._started, 1),
+        }
+        if now - self._logged_at >= LOG_INTERVAL_S:
+            self._logged_at = now
+            logger.info(
+                "Render {} {}: {}/{} frames, {} fps, ETA {}s, segment {}/{}",
+                self.job_id,
+                self.profile,
+                self.frames_done,
+                self.total_frames,
+                self._snapshot["encode_fps"],
+                self._snapshot["eta_s"],
+                self.segment,
+                self.segments_total,
+            )
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return dict(self._snapshot)
+
+    def summary(self) -> dict[str, Any]:
+        """Frames and average encode fps over the encoding phase, for ``render_stats``."""
+        with self._lock:
+            if self._encode_started is None or self._last_frame_at is None:
+                return {"frames": 0, "encode_s": 0.0, "encode_fps": None}
+            encode_s = self._last_frame_at - self._encode_started
+            return {
+                "frames": self.frames_done,
+                "encode_s": round(encode_s, 3),
+                "encode_fps": round(self.frames_done / encode_s, 2) if encode_s > 0 else None,
+            }
+
+
+@contextmanager
+def track_render(job_id: str, timeline: Timeline, interval_s: float) -> Iterator[RenderProgress]:
+    progress = RenderProgress(job_id, timeline, interval_s)
+    with _ACTIVE_LOCK:
+        _ACTIVE[job_id] = progress
+    try:
+        yield progress
+    finally:
+        with _ACTIVE_LOCK:
+            if _ACTIVE.get(job_id) is progress:
+                del _ACTIVE[job_id]
+
+
+def render_progress(job_id: str) -> dict[str, Any] | None:
+    """Latest published snapshot of the job's in-flight render, if any."""
+    with _ACTIVE_LOCK:
+        progress = _ACTIVE.get(job_id)
+    return progress.snapshot() if progress else None
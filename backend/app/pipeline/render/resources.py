@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import subprocess
+import threading
+from contextlib import ExitStack
+from typing import Any, TypeVar
+
+from loguru import logger
+
+from ..control import tracked_process
+
+T = TypeVar("T")
+
+_STATS_LOCK = threading.Lock()
+_STATS = {"opened": 0, "closed": 0, "close_errors": 0, "processes": 0, "leaked": 0, "scopes": 0}
+
+# moviepy modules that start ffmpeg through their own ``subprocess as sp`` alias.
+_MOVIEPY_SUBPROCESS_MODULES = (
+    "moviepy.video.io.ffmpeg_reader",
+    "moviepy.video.io.ffmpeg_writer",
+    "moviepy.audio.io.readers",
+    "moviepy.audio.io.ffmpeg_audiowriter",
+)
+_HOOK_LOCK = threading.Lock()
+_HOOK_INSTALLED = False
+_local = threading.local()
+
+
+def _bump(key: str, amount: int = 1) -> None:
+    with _STATS_LOCK:
+        _STATS[key] += amount
+
+
+def resource_snapshot() -> dict[str, int]:
+    """Process-wide moviepy counters.
+
+    ``leaked`` counts ffmpeg processes still alive after their scope closed
+    (they are killed); ``scopes`` above zero between renders is a scope that
+    was never closed.
+    """
+    with _STATS_LOCK:
+        snapshot = dict(_STATS)
+    snapshot["open"] = snapshot["opened"] - snapshot["closed"]
+    return snapshot
+
+
+def merge_stats(delta: dict[str, int]) -> None:
+    """Fold counters reported by a render worker process into this process."""
+    with _STATS_LOCK:
+        for key, amount in delta.items():
+            if key in _STATS:
+                _STATS[key] += amount
+
+
+class _ScopedSubprocess:
+    """Stands in for ``subprocess`` inside moviepy so every ffmpeg it starts joins the active ClipScope."""
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(subprocess, name)
+
+    @staticmethod
+    def Popen(*args: Any, **kwargs: Any) -> subprocess.Popen:  # noqa: N802
+        process = subprocess.Popen(*args, **kwargs)
+        scope = getattr(_local, "scope", None)
+        if scope is not None:
+            scope.adopt(process)
+        return process
+
+
+def _install_subprocess_hook() -> None:
+    global _HOOK_INSTALLED
+    with _HOOK_LOCK:
+        if _HOOK_INSTALLED:
+            return
+        import importlib
+
+        shim = _ScopedSubprocess()
+        for name in _MOVIEPY_SUBPROCESS_MODULES:
+            importlib.import_module(name).sp = shim
+        _HOOK_INSTALLED = True
+
+
+class ClipScope:
+    """Owns every moviepy clip/reader opened during one render.
+
+    Clips are closed in reverse order when the scope exits, on success and on
+    error alike. Every ffmpeg process moviepy starts on this thread while the
+    scope is active (readers and writers) is recorded and registered with the
+    job's control, so a cancel or deadline kills it even when moviepy is stuck
+    on a pipe; any still alive after ``close()`` is killed and counted as leaked.
+    """
+
+    def __init__(self, label: str) -> None:
+        self.label = label
+        self._clips: list[Any] = []
+        self._processes: list[subprocess.Popen] = []
+        self._tracking = ExitStack()
+        self._previous: ClipScope | None = None
+        self._closed = True
+
+    def own(self, clip: T) -> T:
+        self._clips.append(clip)
+        _bump("opened")
+        return clip
+
+    def adopt(self, process: subprocess.Popen) -> None:
+        self._processes.append(process)
+        self._tracking.enter_context(tracked_process(process))
+        _bump("processes")
+
+    def __enter__(self) -> "ClipScope":
+        _install_subprocess_hook()
+        self._previous = getattr(_local, "scope", None)
+        _local.scope = self
+        self._closed = False
+        _bump("scopes")
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        while self._clips:
+            clip = self._clips.pop()
+            try:
+                clip.close()
+            except Exception as exc:  # noqa: BLE001
+                _bump("close_errors")
+                logger.warning("[{}] closing {} failed: {}", self.label, type(clip).__name__, exc)
+            finally:
+                _bump("closed")
+        # Readers of derived clips and writers abandoned mid-write are not reachable through clip.close().
+        for process in self._processes:
+            if process.poll() is None:
+                _bump("leaked")
+                logger.warning("[{}] killing leaked ffmpeg pid={}", self.label, process.pid)
+                process.kill()
+                try:
+                    process.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    pass
+        self._processes.clear()
+        self._tracking.close()
+        if not self._closed:
+            self._closed = True
+            _local.scope = self._previous
+            _bump("scopes", -1)
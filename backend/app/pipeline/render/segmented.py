@@ -0,0 +1,325 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import tempfile
+import threading
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import Callable
+
+from loguru import logger
+
+from ...config import RenderProfile
+from ..cache import cache_key, file_digest, record_lookup
+from ...metrics import RECLAIMED
+from ..control import JobCancelled, JobControl, checkpoint
+from .ffmpeg_engine import audio_codec_args, build_audio_mix, run_ffmpeg
+from .progress import FrameCallback, RenderProgress
+from .resources import merge_stats, resource_snapshot
+from .timeline import Caption, Segment, Timeline
+
+Renderer = Callable[[Timeline, Path, FrameCallback | None], None]
+
+# Bump when the intermediate encoding changes so stale segments are not reused.
+SEGMENT_FORMAT_VERSION = 3
+
+# How often the parent re-checks for cancellation while pool windows run.
+POOL_POLL_S = 0.5
+# How long cancelled windows get to stop inside their workers before the whole pool is killed.
+CANCEL_GRACE_S = 10.0
+
+_POOL_LOCK = threading.Lock()
+_POOL: ProcessPoolExecutor | None = None
+_POOL_WORKERS = 0
+
+
+@dataclass(frozen=True)
+class SegmentJob:
+    key: str
+    timeline: Timeline
+    output_path: Path
+    index: int = 0  # 1-based position in the full timeline
+
+    @property
+    def frames(self) -> int:
+        return round(self.timeline.duration * self.timeline.fps)
+
+
+def _local_captions(captions: list[Caption], start: float, duration: float) -> list[Caption]:
+    end = start + duration
+    local = []
+    for caption in captions:
+        c_start, c_end = caption.start, caption.start + caption.duration
+        if c_end <= start or c_start >= end:
+            continue
+        local_start = max(c_start, start) - start
+        local_end = min(c_end, end) - start
+        local.append(replace(caption, start=round(local_start, 3), duration=round(local_end - local_start, 3)))
+    return local
+
+
+def plan_segments(timeline: Timeline, engine: str, segments_dir: Path) -> list[SegmentJob]:
+    """Cut the timeline at segment boundaries into independently cacheable renders.
+
+    Each window carries its own slice of the captions, so a caption edit only
+    invalidates the windows it overlaps. The last window absorbs any remainder
+    by holding its final frame, exactly like the single-pass render.
+    """
+    total = timeline.duration
+    windows: list[tuple[Segment | None, float, float]] = []
+    cursor = 0.0
+    for segment in timeline.segments:
+        if cursor >= total - 1e-3:
+            break
+        duration = min(segment.duration, total - cursor)
+        windows.append((segment, cursor, duration))
+        cursor += duration
+    if not windows:
+        windows.append((None, 0.0, total))
+    elif cursor < total:
+        segment, start, duration = windows[-1]
+        windows[-1] = (segment, start, duration + (total - cursor))
+
+    jobs = []
+    for index, (segment, start, duration) in enumerate(windows, start=1):
+        captions = _local_captions(timeline.captions, start, duration)
+        mini = Timeline(
+            duration=duration,
+            profile=timeline.profile,
+            captions=captions,
+            background=timeline.background,
+        )
+        source = "color"
+        if segment is not None:
+            play = min(segment.duration, duration)
+            mini.segments.append(Segment(segment.path, segment.kind, 0.0, play))
+            source = file_digest(segment.path)
+        key = cache_key(
+            "segment",
+            SEGMENT_FORMAT_VERSION,
+            engine,
+            source,
+            [asdict(s) | {"path": None} for s in mini.segments],
+            round(duration, 3),
+            # Encoder threads are a scheduling choice (see _worker_profile), not part of the output.
+            asdict(timeline.profile) | {"threads": None},
+            list(timeline.background),
+            [asdict(c) for c in captions],
+        )
+        jobs.append(SegmentJob(key=key, timeline=mini, output_path=segments_dir / f"{key}.mp4", index=index))
+    return jobs
+
+
+def render_segment(job: SegmentJob, renderer: Renderer, on_frames: FrameCallback | None = None) -> bool:
+    """Render one window into the cache. Returns True on a cache hit."""
+    if job.output_path.exists():
+        return True
+    tmp = job.output_path.with_name(f"{job.key}.{uuid.uuid4().hex[:8]}.tmp.mp4")
+    renderer(job.timeline, tmp, on_frames)
+    tmp.replace(job.output_path)
+    return False
+
+
+def _cancel_requested(marker: Path) -> JobCancelled | None:
+    try:
+        kind, _, reason = marker.read_text(encoding="utf-8").partition("\n")
+    except OSError:
+        return None
+    return JobCancelled(reason, kind)
+
+
+def _render_segment_in_worker(job: SegmentJob, renderer: Renderer, cancel_marker: Path) -> dict[str, int]:
+    """Pool entry point: render one window and report this worker's resource counters for it.
+
+    The parent cancels a job's windows by writing ``cancel_marker``; a watcher
+    thread then cancels a worker-local control, which kills this window's
+    ffmpeg processes and makes its checkpoints raise. The worker itself
+    survives, so windows of other jobs sharing the pool are unaffected.
+    """
+    cancelled = _cancel_requested(cancel_marker)
+    if cancelled is not None:
+        raise cancelled
+    before = resource_snapshot()
+    control = JobControl(cancel_marker.name)
+    stop = threading.Event()
+
+    def watch() -> None:
+        while not stop.wait(POOL_POLL_S):
+            cancelled = _cancel_requested(cancel_marker)
+            if cancelled is not None:
+                control.cancel(cancelled.reason, cancelled.kind)
+                return
+
+    watcher = threading.Thread(target=watch, daemon=True, name="segment-cancel-watch")
+    watcher.start()
+    try:
+        with control.node("render_segment"):
+            render_segment(job, renderer)
+    finally:
+        stop.set()
+        watcher.join()
+    after = resource_snapshot()
+    return {key: after[key] - before[key] for key in after if key != "open"}
+
+
+def _segment_pool(workers: int) -> ProcessPoolExecutor:
+    # Shared across jobs so the configured worker count bounds total render processes.
+    # "spawn" avoids forking a server process that already runs threads.
+    global _POOL, _POOL_WORKERS
+    with _POOL_LOCK:
+        if _POOL is None or _POOL_WORKERS != workers:
+            if _POOL is not None:
+                _POOL.shutdown(wait=False)
+            _POOL = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            _POOL_WORKERS = workers
+        return _POOL
+
+
+def pool_pids() -> list[int]:
+    """PIDs of the shared segment pool's live workers; their ffmpeg children hang off them."""
+    with _POOL_LOCK:
+        pool = _POOL
+    if pool is None:
+        return []
+    return [process.pid for process in list((getattr(pool, "_processes", None) or {}).values()) if process.is_alive()]
+
+
+def _worker_profile(profile: RenderProfile, workers: int) -> RenderProfile:
+    """Split encoder threads across pool workers so the pool does not oversubscribe the CPU."""
+    if workers <= 1:
+        return profile
+    threads = max(1, min(profile.threads, (os.cpu_count() or 1) // workers))
+    return replace(profile, threads=threads)
+
+
+def _reset_pool() -> None:
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is not None:
+            _POOL.shutdown(wait=False, cancel_futures=True)
+        _POOL = None
+
+
+def _kill_pool() -> None:
+    """Tear down the shared pool, killing its workers; their ffmpeg children exit on the broken pipes.
+
+    Last resort for windows that ignored their cancel marker: every other job
+    with windows in the pool fails them with BrokenProcessPool.
+    """
+    global _POOL
+    with _POOL_LOCK:
+        pool, _POOL = _POOL, None
+    if pool is None:
+        return
+    for process in list((getattr(pool, "_processes", None) or {}).values()):
+        if process.is_alive():
+            process.kill()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _render_pending(
+    pending: list[SegmentJob],
+    renderer: Renderer,
+    workers: int,
+    progress: RenderProgress | None = None,
+) -> None:
+    done = 0
+    if workers <= 1 or len(pending) <= 1:
+        for job in pending:
+            checkpoint()
+            render_segment(job, renderer, progress.callback(done, job.index) if progress else None)
+            done += job.frames
+        return
+    # Worker processes cannot call back into this one; progress advances per finished window.
+    pool = _segment_pool(workers)
+    cancel_marker = pending[0].output_path.parent / f".cancel-{uuid.uuid4().hex}"
+    futures = {pool.submit(_render_segment_in_worker, job, renderer, cancel_marker): job for job in pending}
+    try:
+        remaining = set(futures)
+        while remaining:
+            # Poll rather than block so a hung window cannot hold off a cancel or deadline.
+            finished, remaining = wait(remaining, timeout=POOL_POLL_S, return_when=FIRST_COMPLETED)
+            checkpoint()
+            for future in finished:
+                merge_stats(future.result())
+                done += futures[future].frames
+                if progress:
+                    progress.update(done, futures[future].index)
+    except BrokenProcessPool:
+        _reset_pool()
+        raise
+    except JobCancelled as exc:
+        # Queued windows are dropped; windows already handed to a worker are told to stop
+        # through the marker, so only this job's work is torn down.
+        running = [future for future in futures if not future.cancel() and not future.done()]
+        if running:
+            cancel_marker.write_text(f"{exc.kind}\n{exc.reason}", encoding="utf-8")
+            try:
+                _, stuck = wait(running, timeout=CANCEL_GRACE_S)
+            finally:
+                cancel_marker.unlink(missing_ok=True)
+            RECLAIMED.inc(len(running), resource="render_window", reason=exc.kind)
+            if stuck:
+                logger.warning("Killing the segment pool: {} window(s) ignored their cancel", len(stuck))
+                _kill_pool()
+                RECLAIMED.inc(resource="render_pool", reason=exc.kind)
+        raise
+
+
+def concat_and_mux(timeline: Timeline, segment_paths: list[Path], output_path: Path) -> None:
+    with tempfile.TemporaryDirectory(prefix="segment-concat-") as tmp:
+        list_file = Path(tmp) / "segments.txt"
+        list_file.write_text(
+            "".join(f"file '{p.resolve().as_posix()}'\n" for p in segment_paths),
+            encoding="utf-8",
+        )
+        command = ["ffmpeg", "-y", "-hide_banner", "-loglevel", "error", "-f", "concat", "-safe", "0", "-i", str(list_file)]
+        audio_inputs, audio_filters, audio_out = build_audio_mix(timeline, first_input=1)
+        command += audio_inputs
+        if audio_filters:
+            command += ["-filter_complex", ";".join(audio_filters)]
+        command += ["-map", "0:v"]
+        if audio_out:
+            command += ["-map", audio_out, *audio_codec_args(timeline)]
+        command += ["-c:v", "copy", "-t", f"{timeline.duration:.3f}", "-movflags", "+faststart", str(output_path)]
+        run_ffmpeg(command)
+
+
+def render_segmented(
+    timeline: Timeline,
+    output_path: Path,
+    engine: str,
+    renderer: Renderer,
+    segments_dir: Path,
+    workers: int = 1,
+    progress: RenderProgress | None = None,
+) -> None:
+    jobs = plan_segments(timeline, engine, segments_dir)
+    pending: list[SegmentJob] = []
+    for job in jobs:
+        cached = job.output_path.exists()
+        record_lookup("render_segment", "hit" if cached else "miss")
+        if not cached:
+            pending.append(job)
+    active_workers = min(workers, max(1, len(pending)))
+    profile = _worker_profile(timeline.profile, active_workers)
+    pending = [replace(job, timeline=replace(job.timeline, profile=profile)) for job in pending]
+    logger.info(
+        "Segment cache: {}/{} windows reused, rendering {} with {} worker(s) x {} encoder thread(s)",
+        len(jobs) - len(pending),
+        len(jobs),
+        len(pending),
+        active_workers,
+        profile.threads,
+    )
+    if progress:
+        progress.set_total(sum(job.frames for job in pending))
+        progress.set_phase("encoding")
+    _render_pending(pending, renderer, workers, progress)
+    if progress:
+        progress.set_phase("muxing")
+    concat_and_mux(timeline, [job.output_path for job in jobs], output_path)
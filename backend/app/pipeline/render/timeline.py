@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import re
+import sys
+import uuid
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+
+from PIL import Image, ImageOps
+from tqdm import tqdm
+
+from ...config import SETTINGS, RenderProfile
+from ..cache import cache_dir, cache_key, file_digest
+from ..state import ShortState
+from ..utils import estimate_narration_seconds, split_sentences
+from .captions import rasterize_caption
+from .probe import probe_duration
+
+VIDEO_SUFFIXES = {".mp4", ".mov", ".webm", ".mkv"}
+BACKGROUND_COLOR = (20, 24, 35)
+
+
+@dataclass(frozen=True)
+class Segment:
+    path: str
+    kind: str  # "video" | "image"
+    start: float
+    duration: float
+
+
+@dataclass(frozen=True)
+class Caption:
+    text: str
+    start: float
+    duration: float
+    y: int = 1580
+    width: int = 980
+    fontsize: int = 52
+    color: str = "white"
+    image: str = ""
+
+
+@dataclass
+class Timeline:
+    duration: float
+    profile: RenderProfile = SETTINGS.final_profile
+    segments: list[Segment] = field(default_factory=list)
+    captions: list[Caption] = field(default_factory=list)
+    narration: str | None = None
+    music: str | None = None
+    music_duration: float | None = None  # from the music catalog; None means unknown
+    music_volume: float = 0.18
+    audio_bed: str | None = None
+    background: tuple[int, int, int] = BACKGROUND_COLOR
+
+    @property
+    def music_loops(self) -> bool:
+        """Whether the music must be looped to cover the timeline."""
+        return not self.music_duration or self.music_duration < self.duration
+
+    @property
+    def width(self) -> int:
+        return self.profile.width
+
+    @property
+    def height(self) -> int:
+        return self.profile.height
+
+    @property
+    def fps(self) -> int:
+        return self.profile.fps
+
+
+def prescale_still(path: Path, stills_dir: Path, size: tuple[int, int] = (1080, 1920)) -> Path:
+    # Crop/resize once with Pillow so no engine rescales the still per frame.
+    key = cache_key("still", file_digest(path), list(size), "center-crop", "lanczos")
+    out = stills_dir / f"{key}.jpg"
+    if out.exists():
+        return out
+    with Image.open(path) as image:
+        fitted = ImageOps.fit(
+            ImageOps.exif_transpose(image).convert("RGB"),
+            size,
+            method=Image.Resampling.LANCZOS,
+            centering=(0.5, 0.5),
+        )
+    tmp = out.with_name(f"{key}.{uuid.uuid4().hex[:8]}.tmp{out.suffix}")
+    fitted.save(tmp, quality=95)
+    tmp.replace(out)
+    return out
+
+
+def build_captions(
+    script: str,
+    duration: float,
+    scale: float = 1.0,
+    captions_dir: Path | None = None,
+) -> list[Caption]:
+    # Caption geometry is authored for 1080x1920 and scaled to the profile.
+    sentences = split_sentences(script, max_sentences=6)
+    if not sentences:
+        return []
+    seg_duration = max(1.8, duration / len(sentences))
+    captions = []
+    for idx, sentence in enumerate(sentences):
+        text = re.sub(r"\s+", " ", sentence).strip()
+        if not text:
+            continue
+        caption = Caption(
+            text=text,
+            start=idx * seg_duration,
+            duration=seg_duration,
+            y=round(1580 * scale),
+            width=round(980 * scale),
+            fontsize=round(52 * scale),
+        )
+        if captions_dir is not None:
+            image = rasterize_caption(caption.text, caption.fontsize, caption.width, caption.color, captions_dir)
+            caption = replace(caption, image=str(image))
+        captions.append(caption)
+    return captions
+
+
+def build_timeline(state: ShortState, profile: RenderProfile | None = None) -> Timeline:
+    narration = state.get("audio_narration")
+    narration_duration = None
+    if narration and Path(narration).exists():
+        narration_duration = probe_duration(narration)
+    else:
+        narration = None
+
+    target_duration = min(
+        59.0,
+        narration_duration if narration_duration else estimate_narration_seconds(state.get("script", "")),
+    )
+    if target_duration <= 0:
+        target_duration = 18.0
+
+    timeline = Timeline(duration=target_duration, profile=profile or SETTINGS.final_profile, narration=narration)
+    bg_path = state.get("bg_music")
+    if bg_path and Path(bg_path).exists():
+        timeline.music = bg_path
+        timeline.music_duration = state.get("bg_music_duration") or None
+
+    media_paths = list(state.get("clips", [])) + list(state.get("images", []))
+    each_duration = max(2.0, target_duration / max(1, len(media_paths)))
+    stills_dir = cache_dir(state, "stills")
+
+    pbar = tqdm(
+        total=max(1, len(media_paths)),
+        desc=f"job-{state.get('job_id', 'na')}:assemble",
+        unit="clip",
+        disable=not sys.stderr.isatty(),
+    )
+    cursor = 0.0
+    for media_path in media_paths:
+        p = Path(media_path)
+        if not p.exists():
+            pbar.update(1)
+            continue
+        if p.suffix.lower() in VIDEO_SUFFIXES:
+            timeline.segments.append(Segment(str(p), "video", cursor, each_duration))
+        else:
+            still = prescale_still(p, stills_dir, (timeline.width, timeline.height))
+            timeline.segments.append(Segment(str(still), "image", cursor, each_duration))
+        cursor += each_duration
+        pbar.update(1)
+    pbar.close()
+
+    timeline.captions = build_captions(
+        state.get("script", ""),
+        target_duration,
+        scale=timeline.width / 1080,
+        captions_dir=cache_dir(state, "captions"),
+    )
+    return timeline
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Dict, List, Literal
+from typing import Annotated, Any, Dict, List, Literal
 from typing_extensions import TypedDict
 
 
@@ -15,11 +15,41 @@ NextAction = Literal[
     "needs_script_revision",
     "find_more_assets",
     "reassemble",
+    "render_final",
+    "finalize",
     "complete",
     "failed",
 ]
 
 
+class Replace(list):
+    """A full-list write for ``merge_list``; a plain list is appended."""
+
+
+def merge_list(current: list | None, update: list | None) -> list:
+    """Append reducer with explicit full-list writes.
+
+    Parallel branches send only the items they appended. A writer that sends
+    the whole list (the graph input, a node that rebuilt it) wraps it in
+    ``Replace`` so it overwrites the current value instead of duplicating it.
+    """
+    if isinstance(update, Replace):
+        return list(update)
+    return list(current or []) + list(update or [])
+
+
+def merge_counts(current: dict | None, update: dict | None) -> dict:
+    """Per-key max, so concurrent attempt counters never move backwards."""
+    merged = dict(current or {})
+    for key, value in (update or {}).items():
+        merged[key] = max(merged.get(key, 0), value)
+    return merged
+
+
+def merge_dict(current: dict | None, update: dict | None) -> dict:
+    return {**(current or {}), **(update or {})}
+
+
 class AttributionItem(TypedDict, total=False):
     provider: str
     source_url: str
@@ -31,17 +61,34 @@ class ShortState(TypedDict, total=False):
     job_id: str
     topic: str
     script: str
+    script_stream: Dict[str, Any]
+    script_cache: str
+    regenerate_script: bool
     clips: List[str]
     images: List[str]
     audio_narration: str
+    tts_stats: Dict[str, Any]
     bg_music: str
+    bg_music_duration: float
+    preview_video: str
+    preview_profile: str
     final_video: str
+    render_stats: Dict[str, Dict[str, Any]]
     status: str
     next_action: NextAction
-    errors: List[str]
-    attempts: Dict[str, int]
+    errors: Annotated[List[str], merge_list]
+    attempts: Annotated[Dict[str, int], merge_counts]
     asset_queries: List[str]
-    attribution: List[AttributionItem]
+    attribution: Annotated[List[AttributionItem], merge_list]
+    # status/next_action reported by each parallel media branch, read by media_join.
+    branch_results: Annotated[Dict[str, Dict[str, str]], merge_dict]
+    # Input fingerprint of each node's last successful run, used to skip unchanged stages.
+    fingerprints: Annotated[Dict[str, str], merge_dict]
+    # Per node: runs, last_s, total_s.
+    stage_timings: Annotated[Dict[str, Dict[str, float]], merge_dict]
+    # Set when the job runs under the sampling profiler; see data/jobs/<job_id>.profile.folded.
+    profile: bool
+    profile_summary: Dict[str, Any]
     review_notes: str
     human_decision: Literal[
         "approved",
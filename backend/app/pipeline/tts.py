@@ -0,0 +1,285 @@
+from __future__ import annotations
+
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Callable
+
+import requests
+from loguru import logger
+
+from ..config import SETTINGS
+from ..metrics import track_call
+from .cache import cache_key, record_lookup
+from .control import JobCancelled, adopt_job_context, checkpoint, job_context, tracked_response
+from .render.ffmpeg_engine import run_ffmpeg
+from .retry import retry_call
+from .utils import split_sentences
+
+ELEVENLABS_VOICE_SETTINGS = {"stability": 0.4, "similarity_boost": 0.75}
+INFLIGHT_WAIT_S = 120.0
+# Waiters on another job's in-flight synthesis re-check for cancellation this often.
+INFLIGHT_POLL_S = 0.5
+
+_INFLIGHT_LOCK = threading.Lock()
+_INFLIGHT: dict[str, threading.Event] = {}
+
+
+def tts_elevenlabs(script: str, output_path: Path, timings: list[dict] | None = None) -> bool:
+    """Stream ElevenLabs audio straight to ``output_path`` as chunks arrive.
+
+    Memory stays flat regardless of script length; time-to-first-byte and
+    throughput are appended to ``timings`` when given.
+    """
+    if not SETTINGS.elevenlabs_api_key:
+        return False
+
+    def _call() -> bool:
+        checkpoint()
+        started = time.monotonic()
+        first_byte_s: float | None = None
+        received = 0
+        with track_call("tts_elevenlabs"), requests.post(
+            f"{SETTINGS.elevenlabs_base_url}/v1/text-to-speech/{SETTINGS.elevenlabs_voice_id}/stream",
+            headers={
+                "xi-api-key": SETTINGS.elevenlabs_api_key,
+                "Content-Type": "application/json",
+                "Accept": "audio/mpeg",
+            },
+            json={
+                "text": script,
+                "model_id": SETTINGS.elevenlabs_model_id,
+                "voice_settings": ELEVENLABS_VOICE_SETTINGS,
+            },
+            stream=True,
+            timeout=(10, 60),
+        ) as response:
+            response.raise_for_status()
+            # A cancel closes the stream, so a stalled synthesis does not hold the worker.
+            with tracked_response(response), output_path.open("wb") as f:
+                for chunk in response.iter_content(chunk_size=16384):
+                    checkpoint()
+                    if not chunk:
+                        continue
+                    if first_byte_s is None:
+                        first_byte_s = time.monotonic() - started
+                    f.write(chunk)
+                    f.flush()
+                    received += len(chunk)
+            # A stream cut short by a cancel ends like a normal EOF.
+            checkpoint()
+        elapsed = time.monotonic() - started
+        if timings is not None:
+            timings.append(
+                {
+                    "provider": "elevenlabs",
+                    "chars": len(script),
+                    "bytes": received,
+                    "ttfb_ms": round((first_byte_s or elapsed) * 1000, 1),
+                    "total_ms": round(elapsed * 1000, 1),
+                    "throughput_kbps": round(received * 8 / 1000 / elapsed, 1) if elapsed > 0 else 0.0,
+                }
+            )
+        return True
+
+    try:
+        return retry_call("tts_elevenlabs", _call, max_attempts=3)
+    except JobCancelled:
+        output_path.unlink(missing_ok=True)
+        raise
+    except Exception:  # noqa: BLE001
+        return False
+
+
+def tts_gtts(script: str, output_path: Path) -> bool:
+    try:
+        from gtts import gTTS
+    except Exception:
+        return False
+    try:
+        with track_call("tts_gtts"):
+            gTTS(text=script, lang=SETTINGS.gtts_lang).save(str(output_path))
+        return True
+    except Exception:  # noqa: BLE001
+        return False
+
+
+def providers(timings: list[dict]) -> list[tuple[str, Callable[[str, Path], bool], tuple]]:
+    providers = []
+    if SETTINGS.elevenlabs_api_key:
+        providers.append(
+            (
+                "elevenlabs",
+                partial(tts_elevenlabs, timings=timings),
+                (SETTINGS.elevenlabs_voice_id, SETTINGS.elevenlabs_model_id, ELEVENLABS_VOICE_SETTINGS),
+            )
+        )
+    providers.append(("gtts", tts_gtts, (SETTINGS.gtts_lang,)))
+    return providers
+
+
+def synthesize_sentence(
+    sentence: str,
+    provider: str,
+    tts: Callable[[str, Path], bool],
+    voice: tuple,
+    tts_dir: Path,
+) -> tuple[Path | None, bool]:
+    """Returns the cached sentence audio and whether it was a cache hit.
+
+    Concurrent requests for the same sentence are single-flighted, so a
+    narration started while a prefetch is still running waits for it
+    instead of paying for the same synthesis twice.
+    """
+    checkpoint()
+    key = cache_key("tts", provider, sentence, voice)
+    out = tts_dir / f"{key}.mp3"
+    if out.exists():
+        record_lookup("tts_sentence", "hit")
+        return out, True
+    record_lookup("tts_sentence", "miss")
+    with _INFLIGHT_LOCK:
+        done = _INFLIGHT.get(key)
+        owner = done is None
+        if owner:
+            done = _INFLIGHT[key] = threading.Event()
+    if not owner:
+        deadline = time.monotonic() + INFLIGHT_WAIT_S
+        while not done.wait(timeout=INFLIGHT_POLL_S) and time.monotonic() < deadline:
+            checkpoint()
+        return (out, True) if out.exists() else (None, False)
+    try:
+        tmp = tts_dir / f"{key}.{uuid.uuid4().hex[:8]}.tmp.mp3"
+        if not tts(sentence, tmp):
+            tmp.unlink(missing_ok=True)
+            return None, False
+        tmp.replace(out)
+        return out, False
+    finally:
+        with _INFLIGHT_LOCK:
+            _INFLIGHT.pop(key, None)
+        done.set()
+
+
+def concat_audio(pieces: list[Path], output_path: Path) -> None:
+    with tempfile.TemporaryDirectory(prefix="tts-concat-") as tmp:
+        list_file = Path(tmp) / "pieces.txt"
+        list_file.write_text(
+            "".join(f"file '{p.resolve().as_posix()}'\n" for p in pieces),
+            encoding="utf-8",
+        )
+        run_ffmpeg(
+            [
+                "ffmpeg",
+                "-y",
+                "-hide_banner",
+                "-loglevel",
+                "error",
+                "-f",
+                "concat",
+                "-safe",
+                "0",
+                "-i",
+                str(list_file),
+                "-c:a",
+                "libmp3lame",
+                "-q:a",
+                "2",
+                str(output_path),
+            ]
+        )
+
+
+def summarize_timings(timings: list[dict]) -> dict:
+    if not timings:
+        return {"requests": 0}
+    ttfb = sorted(t["ttfb_ms"] for t in timings)
+    return {
+        "requests": len(timings),
+        "bytes": sum(t["bytes"] for t in timings),
+        "ttfb_ms_p50": ttfb[len(ttfb) // 2],
+        "ttfb_ms_max": ttfb[-1],
+        "throughput_kbps_avg": round(sum(t["throughput_kbps"] for t in timings) / len(timings), 1),
+    }
+
+
+def narrate(script: str, tts_dir: Path, timings: list[dict]) -> Path | None:
+    """Synthesize per sentence through the first provider that covers the whole script.
+
+    Sentences are cached by (provider, text, voice, model, settings), so a
+    revision only pays TTS latency for new or edited sentences, and an
+    unchanged script reuses the concatenated track outright.
+    """
+    # No cap: every sentence of the script is narrated, as with the single-request synthesis.
+    sentences = split_sentences(script, max_sentences=len(script))
+    if not sentences:
+        return None
+    for provider, tts, voice in providers(timings):
+        track = tts_dir / f"narration_{cache_key('tts-track', provider, sentences, voice)}.mp3"
+        if track.exists():
+            return track
+        with ThreadPoolExecutor(
+            max_workers=4, thread_name_prefix="tts", initializer=adopt_job_context, initargs=(job_context(),)
+        ) as executor:
+            results = list(
+                executor.map(lambda s: synthesize_sentence(s, provider, tts, voice, tts_dir), sentences)
+            )
+        pieces = [path for path, _ in results if path is not None]
+        if len(pieces) < len(sentences):
+            logger.warning("TTS provider {} failed on {} sentence(s).", provider, len(sentences) - len(pieces))
+            continue
+        logger.info(
+            "TTS {}: {}/{} sentences served from cache.",
+            provider,
+            sum(1 for _, hit in results if hit),
+            len(sentences),
+        )
+        tmp = track.with_name(f"{track.stem}.{uuid.uuid4().hex[:8]}.tmp.mp3")
+        concat_audio(pieces, tmp)
+        tmp.replace(track)
+        return track
+    return None
+
+
+class SentencePrefetcher:
+    """Synthesizes sentences into the TTS cache while the script is still being written.
+
+    Uses the same provider, voice and cache keys as ``narrate``, so the
+    narration stage later finds the prefetched sentences as cache hits.
+    Syntheses may still be running when the script node returns, so they are
+    registered with the job rather than that node: a later cancel or job
+    deadline still closes their streams.
+    """
+
+    def __init__(self, tts_dir: Path, max_workers: int = 4) -> None:
+        self.tts_dir = tts_dir
+        self.timings: list[dict] = []
+        self._provider, self._tts, self._voice = providers(self.timings)[0]
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="tts-prefetch",
+            initializer=adopt_job_context,
+            initargs=(job_context(node_scoped=False),),
+        )
+        self._futures: list[Future] = []
+
+    def submit(self, sentence: str) -> None:
+        self._futures.append(
+            self._executor.submit(
+                synthesize_sentence, sentence, self._provider, self._tts, self._voice, self.tts_dir
+            )
+        )
+
+    def close(self, wait: bool = False) -> dict:
+        self._executor.shutdown(wait=wait)
+        done = [f for f in self._futures if f.done()]
+        return {
+            "provider": self._provider,
+            "submitted": len(self._futures),
+            "finished": len(done),
+            "failed": sum(1 for f in done if f.exception() is not None or f.result()[0] is None),
+        }
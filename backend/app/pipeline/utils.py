@@ -1,9 +1,7 @@
 from __future__ import annotations
 
 import json
-import math
 import re
-import wave
 from datetime import datetime
 from pathlib import Path
 from typing import Iterable, List
@@ -60,6 +58,12 @@ def bump_attempt(state: ShortState, key: str) -> int:
     return attempts[key]
 
 
+def record_render_stats(state: ShortState, stats: dict) -> None:
+    render_stats = dict(state.get("render_stats", {}))
+    render_stats[str(stats.get("profile", "render"))] = stats
+    state["render_stats"] = render_stats
+
+
 def sanitize_filename(text: str, limit: int = 60) -> str:
     cleaned = re.sub(r"[^a-zA-Z0-9_-]+", "_", text).strip("_")
     return (cleaned or "file")[:limit]
@@ -120,19 +124,6 @@ def wrap_lines(text: str, width: int) -> str:
     return "\n".join(lines)
 
 
-def make_tone_wav(path: Path, duration_s: float, freq: float = 220.0, volume: float = 0.1) -> None:
-    sample_rate = 44100
-    amplitude = int(32767 * max(0.0, min(volume, 1.0)))
-    samples = int(sample_rate * max(0.1, duration_s))
-    with wave.open(str(path), "w") as wav_file:
-        wav_file.setnchannels(1)
-        wav_file.setsampwidth(2)
-        wav_file.setframerate(sample_rate)
-        for i in range(samples):
-            value = int(amplitude * math.sin(2 * math.pi * freq * (i / sample_rate)))
-            wav_file.writeframesraw(value.to_bytes(2, byteorder="little", signed=True))
-
-
 def estimate_narration_seconds(script: str) -> float:
     words = max(1, len(script.split()))
     return min(58.0, max(8.0, words / 2.6))
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from types import CodeType, FrameType
+from typing import Iterator
+
+MAX_STACK_DEPTH = 128
+# Label for a job worker thread while no graph node runs on it (checkpointing, JSON persistence).
+RUNNER_LABEL = "job_store"
+
+_ACTIVE_LOCK = threading.Lock()
+_ACTIVE: dict[str, "SamplingProfiler"] = {}
+_local = threading.local()
+
+
+def _frame_name(code: CodeType, cache: dict[CodeType, str]) -> str:
+    name = cache.get(code)
+    if name is None:
+        path = Path(code.co_filename)
+        name = f"{code.co_name} ({'/'.join(path.parts[-2:])}:{code.co_firstlineno})"
+        cache[code] = name
+    return name
+
+
+class SamplingProfiler:
+    """Samples the stacks of one job's threads into folded, flamegraph-compatible counts.
+
+    Only threads attached to the job are sampled, and each stack is rooted at
+    the graph node the thread was running, so ``flamegraph.pl`` or speedscope
+    show the time split per node.
+    """
+
+    def __init__(self, interval_s: float = 0.01) -> None:
+        self.interval_s = max(0.001, interval_s)
+        self.samples: Counter[str] = Counter()
+        self._threads: dict[int, str] = {}
+        self._names: dict[CodeType, str] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def attach(self, ident: int, label: str) -> None:
+        with self._lock:
+            self._threads[ident] = label
+
+    def detach(self, ident: int) -> None:
+        with self._lock:
+            self._threads.pop(ident, None)
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, daemon=True, name="job-profiler")
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            frames = sys._current_frames()
+            with self._lock:
+                threads = list(self._threads.items())
+                for ident in [ident for ident, _ in threads if ident not in frames]:
+                    del self._threads[ident]
+            for ident, label in threads:
+                frame = frames.get(ident)
+                if frame is not None:
+                    self.samples[f"node:{label};{self._stack(frame)}"] += 1
+
+    def _stack(self, frame: FrameType | None) -> str:
+        names: list[str] = []
+        while frame is not None and len(names) < MAX_STACK_DEPTH:
+            names.append(_frame_name(frame.f_code, self._names))
+            frame = frame.f_back
+        names.reverse()
+        return ";".join(names)
+
+    def by_node(self) -> dict[str, int]:
+        totals: Counter[str] = Counter()
+        for stack, count in self.samples.items():
+            totals[stack.split(";", 1)[0].removeprefix("node:")] += count
+        return dict(totals.most_common())
+
+    def write(self, path: Path) -> None:
+        """Merge into ``path`` so a job resumed after review keeps one profile."""
+        merged = Counter(self.samples)
+        if path.exists():
+            for line in path.read_text(encoding="utf-8").splitlines():
+                stack, _, count = line.rpartition(" ")
+                if stack and count.isdigit():
+                    merged[stack] += int(count)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text("".join(f"{stack} {count}\n" for stack, count in sorted(merged.items())), encoding="utf-8")
+        tmp.replace(path)
+        self.samples = merged
+
+
+@contextmanager
+def profile_job(job_id: str, path: Path, interval_s: float) -> Iterator[SamplingProfiler]:
+    """Profile the calling worker thread, and every node run for ``job_id``, until exit."""
+    profiler = SamplingProfiler(interval_s)
+    ident = threading.get_ident()
+    profiler.attach(ident, RUNNER_LABEL)
+    with _ACTIVE_LOCK:
+        _ACTIVE[job_id] = profiler
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        with _ACTIVE_LOCK:
+            _ACTIVE.pop(job_id, None)
+        profiler.stop()
+        profiler.write(path)
+
+
+@contextmanager
+def node_scope(job_id: str | None, node: str) -> Iterator[None]:
+    """Attribute the current thread's samples to ``node`` while it runs (no-op when not profiled)."""
+    profiler = _ACTIVE.get(job_id or "")
+    if profiler is None:
+        yield
+        return
+    ident = threading.get_ident()
+    previous = profiler._threads.get(ident)
+    profiler.attach(ident, node)
+    _local.label = (profiler, node)
+    try:
+        yield
+    finally:
+        _local.label = None
+        if previous is None:
+            profiler.detach(ident)
+        else:
+            profiler.attach(ident, previous)
+
+
+def current_label() -> tuple[SamplingProfiler, str] | None:
+    return getattr(_local, "label", None)
+
+
+def adopt_thread(label: tuple[SamplingProfiler, str] | None) -> None:
+    """ThreadPoolExecutor initializer: sample pool threads under the node that created the pool."""
+    if label is not None:
+        profiler, node = label
+        profiler.attach(threading.get_ident(), node)
@@ -1,3 +1,4 @@
+from .capacity import available_memory_mb, capacity_snapshot, free_disk_mb
 from .dependency_check import check_media_dependencies
 
-__all__ = ["check_media_dependencies"]
+__all__ = ["available_memory_mb", "capacity_snapshot", "check_media_dependencies", "free_disk_mb"]
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import shutil
+from pathlib import Path
+
+_MB = 1024 * 1024
+
+
+def free_disk_mb(path: Path) -> float | None:
+    try:
+        return round(shutil.disk_usage(path).free / _MB, 1)
+    except OSError:
+        return None
+
+
+def available_memory_mb() -> float | None:
+    """MemAvailable from /proc/meminfo (page cache the kernel can reclaim counts as free)."""
+    try:
+        with open("/proc/meminfo", encoding="utf-8") as meminfo:
+            for line in meminfo:
+                if line.startswith("MemAvailable:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except (OSError, ValueError, IndexError):
+        return None
+    return None
+
+
+def capacity_snapshot(data_root: Path) -> dict[str, float | None]:
+    return {"free_disk_mb": free_disk_mb(data_root), "available_memory_mb": available_memory_mb()}
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import os
 import platform
 import shutil
 import subprocess
@@ -30,12 +29,6 @@ SPECS: tuple[DependencySpec, ...] = (
         required=True,
         help_url="https://ffmpeg.org/download.html",
     ),
-    DependencySpec(
-        name="imagemagick",
-        commands=(["magick", "-version"], ["convert", "-version"]),
-        required=False,
-        help_url="https://imagemagick.org/script/download.php",
-    ),
 )
 
 
@@ -59,15 +52,11 @@ def _run_version_command(command: list[str]) -> tuple[bool, str]:
 
 
 def _check_one(spec: DependencySpec) -> dict[str, Any]:
-    env_hint = ""
-    if spec.name == "imagemagick":
-        env_hint = os.getenv("IMAGEMAGICK_BINARY", "")
-
     found_command = None
     detail = "not found"
     for command in spec.commands:
         executable = command[0]
-        if shutil.which(executable) is None and executable != "convert":
+        if shutil.which(executable) is None:
             continue
         ok, message = _run_version_command(command)
         if ok:
@@ -87,7 +76,6 @@ def _check_one(spec: DependencySpec) -> dict[str, Any]:
         "version": detail if found else None,
         "checked_commands": [" ".join(c) for c in spec.commands],
         "active_command": found_command,
-        "env_hint": env_hint or None,
         "help_url": spec.help_url,
     }
 
@@ -4,7 +4,7 @@ import { useCallback, useEffect, useMemo, useState } from "react";
 import JobDetailPanel from "../components/JobDetail";
 import JobList from "../components/JobList";
 import LibraryPanel from "../components/LibraryPanel";
-import { ApiError, createJob, getJob, getJobs, getLibrary, submitReview } from "../lib/api";
+import { ApiError, cancelJob, createJob, getJob, getJobs, getLibrary, submitReview } from "../lib/api";
 import type { JobDetail, JobSummary, LibraryItem, ReviewDecision } from "../types";
 
 export default function Home() {
@@ -86,6 +86,16 @@ export default function Home() {
     }
   };
 
+  const handleCancel = async (jobId: string) => {
+    try {
+      await cancelJob(jobId);
+      await refreshAll();
+      setError(null);
+    } catch (e) {
+      setError(e instanceof Error ? e.message : "failed to cancel job");
+    }
+  };
+
   const selectedTitle = useMemo(() => jobs.find((j) => j.job_id === selectedJobId)?.topic, [jobs, selectedJobId]);
 
   return (
@@ -117,7 +127,7 @@ export default function Home() {
           <JobList jobs={jobs} selectedJobId={selectedJobId} onSelect={setSelectedJobId} />
           <LibraryPanel items={library} />
         </div>
-        <JobDetailPanel job={selectedJob} onReview={handleReview} />
+        <JobDetailPanel job={selectedJob} onReview={handleReview} onCancel={handleCancel} />
       </section>
     </main>
   );
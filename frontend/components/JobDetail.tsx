@@ -7,13 +7,32 @@ import type { JobDetail, ReviewDecision } from "../types";
 type Props = {
   job: JobDetail | null;
   onReview: (jobId: string, decision: ReviewDecision, notes: string) => Promise<void>;
+  onCancel: (jobId: string) => Promise<void>;
 };
 
+type StageTiming = { runs: number; last_s: number; total_s: number };
+type RenderProgress = {
+  profile: string;
+  phase: string;
+  frames_done: number;
+  frames_total: number;
+  percent: number;
+  encode_fps: number;
+  eta_s: number | null;
+  segment: number | null;
+  segments_total: number;
+};
+
+function asStageTimings(value: unknown): [string, StageTiming][] {
+  if (!value || typeof value !== "object") return [];
+  return Object.entries(value as Record<string, StageTiming>).sort((a, b) => b[1].total_s - a[1].total_s);
+}
+
 function asStringArray(value: unknown): string[] {
   return Array.isArray(value) ? value.filter((v): v is string => typeof v === "string") : [];
 }
 
-export default function JobDetailPanel({ job, onReview }: Props) {
+export default function JobDetailPanel({ job, onReview, onCancel }: Props) {
   const [notes, setNotes] = useState("");
   const [submitting, setSubmitting] = useState(false);
 
@@ -21,7 +40,11 @@ export default function JobDetailPanel({ job, onReview }: Props) {
   const clips = useMemo(() => asStringArray(job?.state?.clips_urls), [job?.state]);
   const images = useMemo(() => asStringArray(job?.state?.images_urls), [job?.state]);
   const finalVideo = useMemo(() => String(job?.state?.final_video_url ?? ""), [job?.state]);
+  const previewVideo = useMemo(() => String(job?.state?.preview_video_url ?? ""), [job?.state]);
+  const stageTimings = useMemo(() => asStageTimings(job?.state?.stage_timings), [job?.state]);
+  const renderProgress = (job?.state?.render_progress ?? null) as RenderProgress | null;
   const waitingReview = job?.status === "waiting_review";
+  const cancellable = ["queued", "running", "waiting_review"].includes(job?.status ?? "");
 
   if (!job) {
     return (
@@ -45,7 +68,12 @@ export default function JobDetailPanel({ job, onReview }: Props) {
     <section className="panel detailPanel">
       <header className="panelHeader">
         <h2>{job.topic}</h2>
-        <span>{job.status}</span>
+        <span>{job.queue_position ? `${job.status} (#${job.queue_position} in queue)` : job.status}</span>
+        {cancellable ? (
+          <button disabled={submitting} onClick={() => onCancel(job.job_id)}>
+            Cancel
+          </button>
+        ) : null}
       </header>
 
       <div className="detailGrid">
@@ -55,12 +83,20 @@ export default function JobDetailPanel({ job, onReview }: Props) {
         </article>
 
         <article className="card">
-          <h3>Final Video</h3>
-          {finalVideo ? (
-            <video className="video" controls src={mediaUrl(finalVideo)} />
+          <h3>{finalVideo || !previewVideo ? "Final Video" : "Draft Preview"}</h3>
+          {finalVideo || previewVideo ? (
+            <video className="video" controls src={mediaUrl(finalVideo || previewVideo)} />
           ) : (
             <p>Video will appear after assembly.</p>
           )}
+          {renderProgress ? (
+            <p>
+              Rendering {renderProgress.profile} ({renderProgress.phase}): {renderProgress.frames_done}/
+              {renderProgress.frames_total} frames ({renderProgress.percent}%), {renderProgress.encode_fps} fps
+              {renderProgress.eta_s !== null ? `, ETA ${renderProgress.eta_s}s` : ""}
+              {renderProgress.segment ? `, segment ${renderProgress.segment}/${renderProgress.segments_total}` : ""}
+            </p>
+          ) : null}
         </article>
       </div>
 
@@ -84,6 +120,20 @@ export default function JobDetailPanel({ job, onReview }: Props) {
         </article>
       </div>
 
+      {stageTimings.length ? (
+        <article className="card">
+          <h3>Stage Timings</h3>
+          <ul>
+            {stageTimings.map(([stage, timing]) => (
+              <li key={stage}>
+                {stage}: {timing.total_s.toFixed(1)}s
+                {timing.runs > 1 ? ` (${timing.runs} runs, last ${timing.last_s.toFixed(1)}s)` : ""}
+              </li>
+            ))}
+          </ul>
+        </article>
+      ) : null}
+
       {waitingReview ? (
         <article className="reviewBox">
           <h3>Human Review</h3>
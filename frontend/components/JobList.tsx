@@ -23,7 +23,7 @@ export default function JobList({ jobs, selectedJobId, onSelect }: Props) {
             onClick={() => onSelect(job.job_id)}
           >
             <strong>{job.topic}</strong>
-            <small>{job.status}</small>
+            <small>{job.queue_position ? `${job.status} #${job.queue_position}` : job.status}</small>
           </button>
         ))}
         {jobs.length === 0 ? <p className="empty">No jobs yet.</p> : null}
@@ -57,6 +57,10 @@ export function submitReview(
   });
 }
 
+export function cancelJob(jobId: string): Promise<JobSummary> {
+  return request<JobSummary>(`/api/jobs/${jobId}/cancel`, { method: "POST" });
+}
+
 export function getLibrary(): Promise<LibraryItem[]> {
   return request<LibraryItem[]>("/api/library");
 }
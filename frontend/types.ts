@@ -1,4 +1,4 @@
-export type JobStatus = "queued" | "running" | "waiting_review" | "completed" | "failed";
+export type JobStatus = "queued" | "running" | "waiting_review" | "completed" | "failed" | "cancelled";
 
 export type JobSummary = {
   job_id: string;
@@ -6,6 +6,7 @@ export type JobSummary = {
   status: JobStatus | string;
   created_at: string;
   updated_at: string;
+  queue_position?: number | null;
 };
 
 export type JobDetail = {
@@ -17,6 +18,7 @@ export type JobDetail = {
   updated_at: string;
   review_payload?: Record<string, unknown> | null;
   state: Record<string, unknown>;
+  queue_position?: number | null;
   error?: string | null;
 };
 
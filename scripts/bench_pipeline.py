@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+TERMINAL = {"completed", "failed", "cancelled"}
+
+
+def _cpu_seconds() -> float:
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+def _child(jobs: int, concurrency: int) -> dict:
+    """Push ``jobs`` jobs through a fresh JobStore, ``concurrency`` at a time, approving every review."""
+    from backend.app.bench.stats import summarize
+    from backend.app.job_store import JobStore
+    from backend.app.pipeline.render import RssSampler
+
+    store = JobStore()
+    queue = [f"benchmark topic {idx}" for idx in range(jobs)]
+    active: dict[str, float] = {}
+    finished: list[dict] = []
+    cpu_started = _cpu_seconds()
+    started = time.monotonic()
+    with RssSampler() as rss:
+        while queue or active:
+            while queue and len(active) < concurrency:
+                record = store.create_job(queue.pop(0))
+                store.start_job(record.job_id)
+                active[record.job_id] = time.monotonic()
+            for job_id in list(active):
+                record = store.get_job(job_id)
+                if record is None:
+                    continue
+                if record.status == "waiting_review":
+                    store.resume_job(job_id, {"human_decision": "approved", "review_notes": ""})
+                elif record.status in TERMINAL:
+                    finished.append(
+                        {
+                            "status": record.status,
+                            "latency_s": time.monotonic() - active.pop(job_id),
+                            "stages": record.state.get("stage_timings", {}),
+                        }
+                    )
+            time.sleep(0.05)
+    wall_s = time.monotonic() - started
+    cpu_s = _cpu_seconds() - cpu_started
+
+    stage_names = sorted({name for job in finished for name in job["stages"]})
+    completed = [job for job in finished if job["status"] == "completed"]
+    cancelled = sum(1 for job in finished if job["status"] == "cancelled")
+    return {
+        "concurrency": concurrency,
+        "jobs": jobs,
+        "completed": len(completed),
+        "failed": len(finished) - len(completed) - cancelled,
+        "cancelled": cancelled,
+        "wall_s": round(wall_s, 3),
+        "jobs_per_hour": round(len(completed) / wall_s * 3600, 2) if wall_s > 0 else 0.0,
+        "cpu_s": round(cpu_s, 3),
+        "cpu_cores_used": round(cpu_s / wall_s, 2) if wall_s > 0 else 0.0,
+        "peak_rss_mb": rss.peak_mb,
+        "job_latency_s": summarize(job["latency_s"] for job in finished),
+        "stages_s": {
+            name: summarize(job["stages"][name]["total_s"] for job in finished if name in job["stages"])
+            for name in stage_names
+        },
+    }
+
+
+def _run_level(args: argparse.Namespace, concurrency: int, urls: dict[str, str]) -> dict:
+    with tempfile.TemporaryDirectory(prefix="bench-pipeline-") as tmp:
+        env = dict(
+            os.environ,
+            DATA_ROOT=tmp,
+            OPENAI_API_KEY="fake",
+            OPENAI_BASE_URL=f"{urls['llm']}/v1",
+            ELEVENLABS_API_KEY="fake",
+            ELEVENLABS_BASE_URL=urls["tts"],
+            PEXELS_API_KEY="fake",
+            PEXELS_BASE_URL=urls["pexels"],
+            # The child paces submissions itself; give the store a worker slot per concurrent job.
+            MAX_ACTIVE_JOBS=str(concurrency),
+        )
+        completed = subprocess.run(
+            [sys.executable, __file__, "--child", str(args.jobs), str(concurrency)],
+            env=env,
+            stdout=subprocess.PIPE,
+            text=True,
+            check=True,
+        )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Offline end-to-end pipeline benchmark on local provider fakes.")
+    parser.add_argument("--jobs", type=int, default=4, help="jobs per concurrency level")
+    parser.add_argument("--concurrency", default="1,2,4", help="comma-separated concurrency levels")
+    parser.add_argument("--llm-token-delay", type=float, default=0.01, help="seconds between LLM tokens")
+    parser.add_argument("--tts-latency", type=float, default=0.2, help="seconds before TTS first byte")
+    parser.add_argument("--pexels-latency", type=float, default=0.1, help="seconds per search/download request")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of fake requests answered 503")
+    parser.add_argument("--payload-scale", type=float, default=1.0, help="multiplier on image and audio sizes")
+    parser.add_argument("--video", help="mp4 served for video search results (none by default)")
+    parser.add_argument("--warm", action="store_true", help="same script for every job, so TTS/caption caches hit")
+    parser.add_argument("--out", help="write the JSON report here as well as to stdout")
+    parser.add_argument("--child", nargs=2, type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        print(json.dumps(_child(*args.child)))
+        return 0
+
+    from backend.app.bench.fakes import FakeBehavior, FakeLLMServer, FakePexelsServer, FakeTTSServer
+
+    def behavior(**kwargs: float) -> FakeBehavior:
+        return FakeBehavior(error_rate=args.error_rate, payload_scale=args.payload_scale, **kwargs)
+
+    pexels_options = {"video_path": args.video} if args.video else {}
+    with FakeLLMServer(behavior(chunk_delay_s=args.llm_token_delay), vary=not args.warm) as llm, FakeTTSServer(
+        behavior(latency_s=args.tts_latency)
+    ) as tts, FakePexelsServer(behavior(latency_s=args.pexels_latency), **pexels_options) as pexels:
+        servers = {"llm": llm, "tts": tts, "pexels": pexels}
+        urls = {name: server.url for name, server in servers.items()}
+        levels = []
+        for concurrency in (int(v) for v in args.concurrency.split(",") if v.strip()):
+            before = {name: server.requests for name, server in servers.items()}
+            level = _run_level(args, concurrency, urls)
+            level["provider_requests"] = {name: server.requests - before[name] for name, server in servers.items()}
+            levels.append(level)
+            print(
+                f"concurrency={concurrency}: {level['completed']}/{args.jobs} completed, "
+                f"{level['jobs_per_hour']} jobs/h, p95 latency {level['job_latency_s']['p95']}s",
+                file=sys.stderr,
+            )
+
+    report = {
+        "config": {key: value for key, value in vars(args).items() if key != "child"},
+        "levels": levels,
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        Path(args.out).write_text(text + "\n", encoding="utf-8")
+    print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+def _run_once(streaming: bool, llm_url: str, tts_url: str) -> dict:
+    """Run script_generator + audio_narration in a fresh process with the given mode."""
+    with tempfile.TemporaryDirectory(prefix="bench-script-tts-") as tmp:
+        env = dict(
+            os.environ,
+            OPENAI_API_KEY="fake",
+            OPENAI_BASE_URL=f"{llm_url}/v1",
+            ELEVENLABS_API_KEY="fake",
+            ELEVENLABS_BASE_URL=tts_url,
+            SCRIPT_STREAMING="true" if streaming else "false",
+        )
+        completed = subprocess.run(
+            [sys.executable, __file__, "--child", tmp],
+            env=env,
+            stdout=subprocess.PIPE,
+            text=True,
+            check=True,
+        )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def _child(workdir: str) -> None:
+    from backend.app.pipeline.nodes import audio_narration, script_generator
+
+    state = {
+        "job_id": "bench",
+        "topic": "pipelined narration",
+        "assets_dir": str(Path(workdir) / "assets"),
+        "output_dir": str(Path(workdir) / "output"),
+    }
+    started = time.monotonic()
+    state = script_generator(state)
+    script_done = time.monotonic()
+    state = audio_narration(state)
+    finished = time.monotonic()
+    print(
+        json.dumps(
+            {
+                "script_s": round(script_done - started, 3),
+                "narration_s": round(finished - script_done, 3),
+                "total_s": round(finished - started, 3),
+                "script_stream": state.get("script_stream"),
+                "tts_stats": state.get("tts_stats"),
+                "errors": state.get("errors", []),
+            }
+        )
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare sequential vs pipelined script -> TTS on local fakes.")
+    parser.add_argument("--token-delay", type=float, default=0.05, help="seconds between LLM tokens")
+    parser.add_argument("--tts-latency", type=float, default=0.4, help="seconds before TTS first byte")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        _child(args.child)
+        return 0
+
+    from backend.app.bench.fakes import FakeBehavior, FakeLLMServer, FakeTTSServer
+
+    with FakeLLMServer(FakeBehavior(chunk_delay_s=args.token_delay)) as llm, FakeTTSServer(
+        FakeBehavior(latency_s=args.tts_latency)
+    ) as tts:
+        report = {
+            "sequential": _run_once(False, llm.url, tts.url),
+            "pipelined": _run_once(True, llm.url, tts.url),
+        }
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
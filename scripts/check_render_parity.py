@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.app.config import SETTINGS, RenderProfile
+from backend.app.pipeline.cache import cache_dir
+from backend.app.pipeline.procedural_audio import write_wav
+from backend.app.pipeline.render import ENGINES, build_timeline, render_timeline
+from backend.app.pipeline.render.audio_bed import build_audio_bed
+from backend.app.pipeline.utils import ensure_runtime_dirs, make_placeholder_image
+
+MIN_PSNR_DB = 25.0
+MAX_DURATION_DELTA_S = 0.15
+MAX_LOUDNESS_DELTA_DB = 1.0
+
+
+def _probe(path: Path) -> dict:
+    completed = subprocess.run(
+        ["ffprobe", "-v", "error", "-show_streams", "-show_format", "-of", "json", str(path)],
+        stdout=subprocess.PIPE,
+        text=True,
+        check=True,
+    )
+    raw = json.loads(completed.stdout)
+    video = next(s for s in raw["streams"] if s["codec_type"] == "video")
+    audio = next((s for s in raw["streams"] if s["codec_type"] == "audio"), None)
+    return {
+        "duration": float(raw["format"]["duration"]),
+        "width": int(video["width"]),
+        "height": int(video["height"]),
+        "has_audio": audio is not None,
+        "channels": int(audio["channels"]) if audio else 0,
+        "mean_volume_db": _mean_volume(path) if audio else None,
+    }
+
+
+def _mean_volume(path: Path) -> float | None:
+    completed = subprocess.run(
+        ["ffmpeg", "-hide_banner", "-i", str(path), "-map", "0:a", "-af", "volumedetect", "-f", "null", "-"],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        check=False,
+    )
+    match = re.search(r"mean_volume:\s*(-?[0-9.]+|-inf) dB", completed.stdout)
+    if not match or match.group(1) == "-inf":
+        return None
+    return float(match.group(1))
+
+
+def _psnr(a: Path, b: Path) -> float:
+    completed = subprocess.run(
+        ["ffmpeg", "-hide_banner", "-i", str(a), "-i", str(b), "-lavfi", "psnr", "-f", "null", "-"],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        check=False,
+    )
+    match = re.search(r"average:(inf|[0-9.]+)", completed.stdout)
+    if not match:
+        return 0.0
+    return float("inf") if match.group(1) == "inf" else float(match.group(1))
+
+
+def _write_test_clip(path: Path, duration_s: float) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    subprocess.run(
+        [
+            "ffmpeg",
+            "-y",
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-f",
+            "lavfi",
+            "-i",
+            f"testsrc2=size=640x360:rate=30:duration={duration_s}",
+            "-pix_fmt",
+            "yuv420p",
+            str(path),
+        ],
+        check=True,
+    )
+
+
+def _compare(reports: dict[str, dict], psnr: float) -> list[str]:
+    a, b = reports["moviepy"], reports["ffmpeg"]
+    problems = []
+    if abs(a["duration"] - b["duration"]) > MAX_DURATION_DELTA_S:
+        problems.append(f"duration {a['duration']:.3f}s vs {b['duration']:.3f}s")
+    if (a["width"], a["height"]) != (b["width"], b["height"]):
+        problems.append(f"size {a['width']}x{a['height']} vs {b['width']}x{b['height']}")
+    if (a["has_audio"], a["channels"]) != (b["has_audio"], b["channels"]):
+        problems.append(f"audio channels {a['channels']} vs {b['channels']}")
+    if a["mean_volume_db"] is not None and b["mean_volume_db"] is not None:
+        if abs(a["mean_volume_db"] - b["mean_volume_db"]) > MAX_LOUDNESS_DELTA_DB:
+            problems.append(f"mean volume {a['mean_volume_db']}dB vs {b['mean_volume_db']}dB")
+    elif a["mean_volume_db"] != b["mean_volume_db"]:
+        problems.append("audio is silent in only one engine")
+    if psnr < MIN_PSNR_DB:
+        problems.append(f"psnr {psnr:.2f}dB < {MIN_PSNR_DB}dB")
+    return problems
+
+
+def check_parity(root: Path, profile: RenderProfile | None = None) -> dict:
+    """Render one fixture (stills, a video clip, narration and looped music) with every engine.
+
+    Runs twice, mixing the audio during the encode and from a pre-mixed bed,
+    and compares the moviepy and ffmpeg outputs of each.
+    """
+    state = ensure_runtime_dirs({"assets_dir": str(root / "assets"), "output_dir": str(root / "output")})
+    # Shorter than its segment, so both engines also have to hold the clip's last frame.
+    clip = root / "assets" / "clips" / "clip.mp4"
+    _write_test_clip(clip, 1.5)
+    images = []
+    for idx in range(3):
+        path = root / "assets" / "images" / f"still_{idx}.jpg"
+        make_placeholder_image(path, f"Parity still {idx}", size=(1280 + idx * 200, 960))
+        images.append(str(path))
+    narration = root / "assets" / "audio" / "narration.wav"
+    music = root / "assets" / "music" / "music.wav"
+    write_wav(narration, 8.0, [(250.0, 1.0)], volume=0.1)
+    write_wav(music, 2.5, [(112.0, 1.0)], volume=0.05)
+    state.update(
+        {
+            "job_id": "parity",
+            "script": "First caption line. Second caption line. Third caption line.",
+            "clips": [str(clip)],
+            "images": images,
+            "audio_narration": str(narration),
+            "bg_music": str(music),
+        }
+    )
+
+    results = {}
+    for variant in ("mixed", "audio_bed"):
+        timeline = build_timeline(state, profile)
+        if variant == "audio_bed":
+            bed = build_audio_bed(timeline, cache_dir(state, "audio_beds"))
+            timeline.audio_bed = str(bed) if bed else None
+        outputs = {}
+        for engine in sorted(ENGINES):
+            out = root / "output" / f"{variant}_{engine}.mp4"
+            render_timeline(timeline, out, engine=engine)
+            outputs[engine] = out
+        reports = {engine: _probe(path) for engine, path in outputs.items()}
+        psnr = _psnr(outputs["moviepy"], outputs["ffmpeg"])
+        results[variant] = {"problems": _compare(reports, psnr), "psnr_db": psnr, "engines": reports}
+    return {"ok": not any(r["problems"] for r in results.values()), "variants": results}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare the moviepy and ffmpeg render engines on one fixture.")
+    parser.add_argument("--profile", choices=("draft", "final"), default="final")
+    args = parser.parse_args()
+    profile = SETTINGS.draft_profile if args.profile == "draft" else SETTINGS.final_profile
+    with tempfile.TemporaryDirectory(prefix="render-parity-") as tmp:
+        report = check_parity(Path(tmp), profile)
+    print(json.dumps(report, indent=2))
+    return 0 if report["ok"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
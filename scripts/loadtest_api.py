@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+# Relative request weights per scenario.
+SCENARIOS: dict[str, dict[str, float]] = {
+    "polling": {"list_jobs": 3, "get_job": 6, "library": 1},
+    "mixed": {"list_jobs": 3, "get_job": 5, "library": 1, "media": 1, "create_job": 0.2},
+    "library": {"library": 4, "media": 1},
+}
+ENDPOINT_PATHS = {
+    "list_jobs": "/api/jobs",
+    "get_job": "/api/jobs/{job_id}",
+    "library": "/api/library",
+    "media": "/media/output/short_final_seed.mp4",
+}
+STATUSES = ("completed", "completed", "completed", "failed", "waiting_review")
+
+
+def seed(data_root: Path, jobs: int, library: int, rng: random.Random) -> list[str]:
+    """Write synthetic job records and library metadata shaped like the real ones."""
+    jobs_dir = data_root / "jobs"
+    output_dir = data_root / "output"
+    assets_dir = data_root / "assets"
+    for folder in (jobs_dir, output_dir, assets_dir / "images"):
+        folder.mkdir(parents=True, exist_ok=True)
+    video = output_dir / "short_final_seed.mp4"
+    video.write_bytes(os.urandom(512 * 1024))
+
+    now = datetime.now(timezone.utc)
+    job_ids = []
+    for idx in range(jobs):
+        job_id = f"job-seed{idx:06d}"
+        job_ids.append(job_id)
+        created = now - timedelta(minutes=jobs - idx)
+        status = rng.choice(STATUSES)
+        state = {
+            "job_id": job_id,
+            "topic": f"seeded topic {idx}",
+            "status": status,
+            "script": " ".join(f"Sentence {n} about seeded topic {idx}." for n in range(9)),
+            "images": [str(assets_dir / "images" / f"seed_{idx}_{n}.jpg") for n in range(6)],
+            "clips": [],
+            "attribution": [
+                {"provider": "pexels", "source_url": f"https://example.invalid/{idx}/{n}", "license": "Pexels License"}
+                for n in range(6)
+            ],
+            "errors": [],
+            "final_video": str(video) if status == "completed" else "",
+            "stage_timings": {"script_generator": {"runs": 1, "last_s": 1.2, "total_s": 1.2}},
+        }
+        payload = {
+            "job_id": job_id,
+            "thread_id": f"thread-{job_id}",
+            "topic": state["topic"],
+            "status": status,
+            "created_at": created.isoformat(),
+            "updated_at": created.isoformat(),
+            "review_payload": {"message": "Review required"} if status == "waiting_review" else None,
+            "error": None,
+            "state": state,
+        }
+        (jobs_dir / f"{job_id}.json").write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
+    for idx in range(library):
+        meta = output_dir / f"short_metadata_{idx:06d}.json"
+        meta.write_text(
+            json.dumps(
+                {
+                    "job_id": f"job-seed{idx:06d}",
+                    "topic": f"seeded topic {idx}",
+                    "script": "Seeded script.",
+                    "final_video": str(video),
+                },
+                indent=2,
+            ),
+            encoding="utf-8",
+        )
+    return job_ids
+
+
+def _serve(port: int, stub_delay: float) -> None:
+    import uvicorn
+
+    from backend.app import main as api
+    from backend.app.bench.stub_graph import StubGraph
+    from backend.app.job_store import JobStore
+
+    api.store = JobStore(graph=StubGraph(stub_delay))
+    uvicorn.run(api.app, host="127.0.0.1", port=port, log_level="warning")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_ready(base_url: str, timeout_s: float = 60.0) -> None:
+    import requests
+
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(f"{base_url}/health", timeout=1).ok:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"API at {base_url} did not become ready")
+
+
+def _client(
+    base_url: str,
+    weights: dict[str, float],
+    job_ids: list[str],
+    deadline: float,
+    think_s: float,
+    seed_value: int,
+    results: list[tuple[str, float, int]],
+) -> None:
+    import requests
+
+    rng = random.Random(seed_value)
+    names = list(weights)
+    session = requests.Session()
+    local: list[tuple[str, float, int]] = []
+    while time.monotonic() < deadline:
+        name = rng.choices(names, weights=list(weights.values()))[0]
+        started = time.perf_counter()
+        try:
+            if name == "create_job":
+                response = session.post(f"{base_url}/api/jobs", json={"topic": "load test topic"}, timeout=30)
+            else:
+                path = ENDPOINT_PATHS[name].format(job_id=rng.choice(job_ids))
+                response = session.get(f"{base_url}{path}", timeout=30)
+            status = response.status_code
+        except requests.RequestException:
+            status = 0
+        local.append((name, time.perf_counter() - started, status))
+        if think_s:
+            time.sleep(think_s)
+    results.extend(local)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Load-test the FastAPI surface against a stubbed graph.")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="polling")
+    parser.add_argument("--clients", type=int, default=100, help="concurrent polling clients")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds of load")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="pause between a client's requests")
+    parser.add_argument("--seed-jobs", type=int, default=2000, help="synthetic job records to seed")
+    parser.add_argument("--seed-library", type=int, default=1000, help="synthetic short_metadata files to seed")
+    parser.add_argument("--stub-delay", type=float, default=0.05, help="seconds the stub graph takes per job")
+    parser.add_argument("--out", help="write the JSON report here as well as to stdout")
+    parser.add_argument("--serve", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.serve:
+        _serve(int(args.serve[0]), float(args.serve[1]))
+        return 0
+
+    from backend.app.bench.stats import summarize
+
+    rng = random.Random(7)
+    with tempfile.TemporaryDirectory(prefix="loadtest-api-") as tmp:
+        seed_started = time.monotonic()
+        job_ids = seed(Path(tmp), args.seed_jobs, args.seed_library, rng) or ["job-missing"]
+        seed_s = time.monotonic() - seed_started
+
+        port = _free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        server = subprocess.Popen(
+            [sys.executable, __file__, "--serve", str(port), str(args.stub_delay)],
+            env=dict(os.environ, DATA_ROOT=tmp),
+        )
+        try:
+            _wait_ready(base_url)
+            results: list[tuple[str, float, int]] = []
+            deadline = time.monotonic() + args.duration
+            threads = [
+                threading.Thread(
+                    target=_client,
+                    args=(base_url, SCENARIOS[args.scenario], job_ids, deadline, args.think_ms / 1000, idx, results),
+                    daemon=True,
+                )
+                for idx in range(args.clients)
+            ]
+            started = time.monotonic()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.monotonic() - started
+        finally:
+            server.terminate()
+            server.wait(timeout=10)
+
+    endpoints = {}
+    for name in SCENARIOS[args.scenario]:
+        rows = [row for row in results if row[0] == name]
+        # 429 is admission control pushing back, not a failure of the endpoint.
+        rejected = sum(1 for row in rows if row[2] == 429)
+        errors = sum(1 for row in rows if row[2] == 0 or (row[2] >= 400 and row[2] != 429))
+        endpoints[name] = {
+            "requests": len(rows),
+            "rejected": rejected,
+            "errors": errors,
+            "error_rate": round(errors / len(rows), 4) if rows else 0.0,
+            "rps": round(len(rows) / elapsed, 2) if elapsed > 0 else 0.0,
+            "latency_ms": summarize(row[1] * 1000 for row in rows),
+        }
+    report = {
+        "config": {key: value for key, value in vars(args).items() if key != "serve"},
+        "seed_s": round(seed_s, 3),
+        "elapsed_s": round(elapsed, 3),
+        "total_requests": len(results),
+        "endpoints": endpoints,
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        Path(args.out).write_text(text + "\n", encoding="utf-8")
+    print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
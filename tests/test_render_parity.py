@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+import shutil
+
+import pytest
+
+pytest.importorskip("moviepy")
+pytestmark = pytest.mark.skipif(
+    shutil.which("ffmpeg") is None or shutil.which("ffprobe") is None,
+    reason="render parity needs ffmpeg and ffprobe on PATH",
+)
+
+from backend.app.config import RenderProfile  # noqa: E402
+from scripts.check_render_parity import check_parity  # noqa: E402
+
+TINY = RenderProfile(name="parity", width=180, height=320, fps=15, preset="ultrafast", crf=28, threads=1)
+
+
+def test_engines_agree_on_tiny_fixture(tmp_path):
+    report = check_parity(tmp_path, TINY)
+    problems = {variant: result["problems"] for variant, result in report["variants"].items()}
+    assert report["ok"], problems
+    for result in report["variants"].values():
+        assert all(engine["channels"] == 2 for engine in result["engines"].values())